@@ -20,16 +20,15 @@ class ImageAnnotationGUI(UI):
         controller: The controller object for the application.
 
     Example:
-        >>> from annotator.annotation_store import AnnotationStore
-        >>> from annotator.annotation_ui import ImageAnnotationGUI
-        >>> from annotator.controller import Controller
-        >>> from yolo import YOLO
-        >>> model = YOLO("yolov8m.pt")
-        >>> store = AnnotationStore("path/to/data", model, available_labels=["label1", "label2"])
-        >>> controller = Controller(store)
-        >>> app = ImageAnnotationGUI(controller)
-        >>> controller.set_view(app)
-        >>> app.mainloop()
+        >>> from ultralytics import YOLO  # doctest: +SKIP
+        >>> from annotator.annotation_ui import ImageAnnotationGUI  # doctest: +SKIP
+        >>> from annotator.controller import Controller  # doctest: +SKIP
+        >>> from annotator.model.yolo_detection_model import YOLODetectionModel  # doctest: +SKIP
+        >>> model = YOLODetectionModel(YOLO("yolov8m.pt"), ["label1", "label2"])  # doctest: +SKIP
+        >>> controller = Controller(["label1", "label2"], model, ["path/to/image.jpg"])  # doctest: +SKIP
+        >>> app = ImageAnnotationGUI(controller)  # doctest: +SKIP
+        >>> controller.set_view(app)  # doctest: +SKIP
+        >>> app.mainloop()  # doctest: +SKIP
     """
 
     INITIAL_WIDTH = 1200
@@ -44,6 +43,7 @@ class ImageAnnotationGUI(UI):
         self.geometry(f"{self.INITIAL_WIDTH}x{self.INITIAL_HEIGHT}")
 
         self.controller = controller
+        self._refresh_pending = False
 
         self.setup_gui()
 
@@ -66,7 +66,18 @@ class ImageAnnotationGUI(UI):
         self.content.pack()
 
     def refresh_all(self) -> None:
-        """Refresh all GUI elements."""
+        """Refresh all GUI elements.
+
+        The refresh runs once the event loop is idle, so that multiple requests in a row, e.g. when adding
+        several images, only rebuild the GUI once.
+        """
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._flush_refresh)
+
+    def _flush_refresh(self) -> None:
+        """Run the pending refresh of all GUI elements."""
+        self._refresh_pending = False
         self.left_sidebar.update()
         self.right_sidebar.update()
         self.content.new_image()
@@ -76,10 +87,16 @@ class ImageAnnotationGUI(UI):
         """Redraw the content area."""
         self.content.update(only_boxes)
 
+    def is_busy(self) -> bool:
+        """Whether the user is drawing or resizing a bounding box, the boxes must not be redrawn meanwhile."""
+        return self.content.state != Content.EventState.IDLE
+
     def refresh_left_sidebar(self) -> None:
-        """Refresh the left sidebar."""
-        self.left_sidebar.update()
+        """Refresh the left sidebar, unless a pending refresh of all GUI elements covers it."""
+        if not self._refresh_pending:
+            self.left_sidebar.update()
 
     def refresh_right_sidebar(self) -> None:
-        """Refresh the right sidebar."""
-        self.right_sidebar.update()
+        """Refresh the right sidebar, unless a pending refresh of all GUI elements covers it."""
+        if not self._refresh_pending:
+            self.right_sidebar.update()
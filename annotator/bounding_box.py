@@ -1,7 +1,9 @@
 """Bounding box class for drawing and resizing bounding boxes on a canvas."""
 
+import weakref
 from collections.abc import Callable
-from tkinter import TclError
+from functools import partial
+from tkinter import font as tkfont
 
 import customtkinter as ctk
 
@@ -18,6 +20,27 @@ RESIZE_CURSORS = {
     "e": "right_side",
 }
 
+# the corner coordinates (x1, y1, x2, y2) that each handle moves while resizing
+RESIZE_EDGES = {
+    "nw": (True, True, False, False),
+    "ne": (False, True, True, False),
+    "sw": (True, False, False, True),
+    "se": (False, False, True, True),
+    "n": (False, True, False, False),
+    "s": (False, False, False, True),
+    "w": (True, False, False, False),
+    "e": (False, False, True, False),
+}
+
+# the order of the centers returned by `BoundingBox._handle_centers`, corners first
+HANDLE_ORDER = ("nw", "ne", "sw", "se", "n", "e", "s", "w")
+
+# canvases on which the cursor events of the resize handles are bound, which is done once per canvas
+_BOUND_CANVASES: "weakref.WeakSet[ctk.CTkCanvas]" = weakref.WeakSet()
+
+# fonts are shared by all bounding boxes, keyed by (family, size)
+_FONT_CACHE: dict[tuple[str, int], tkfont.Font] = {}
+
 
 class BoundingBox:
     """ "Bounding box class for drawing and resizing bounding boxes on a canvas.
@@ -61,18 +84,41 @@ class BoundingBox:
         self.label_font_size = label_font_size
         self.label_font = label_font
         self.handle_size = handle_size
+        # an integer, so that handles around integer coordinates are drawn on whole pixels
+        self._half = handle_size // 2
         self.handles: dict[str, int] = {}
         self.resizing = False
+        self.active_handle: str | None = None
+        # mouse motions are applied once per idle loop, only the latest position is kept until then
+        self._pending_resize: tuple[int, int] | None = None
+        self._resize_job: str | None = None
+        # the class color is looked up once and only again when the class changes, not on every redraw
+        self._color_uid = class_uid
+        self._color = controller.get_class_color(class_uid)
 
         self.draw()
         self._create_handles()
 
+    def _class_color(self) -> str:
+        """The color of the class of the bounding box."""
+        if self._color_uid != self.class_uid:
+            self._color_uid = self.class_uid
+            self._color = self.controller.get_class_color(self.class_uid)
+        return self._color
+
     def draw(self):
         """Draw the bounding box on the canvas."""
-        self.rect = self.canvas.create_rectangle(
-            *self.box, outline=self.controller.get_class_color(self.class_uid), tags="bbox"
-        )
+        color = self._class_color()
+        self.rect = self.canvas.create_rectangle(*self.box, outline=color, tags="bbox")
         text = f"{self.id}: {self.label}" if self.id is not None else f"{self.label}"
+        self._measure_label(text)
+        # the filled rectangle behind the label is created first, so that the label is stacked above it
+        self.label_bg = self.canvas.create_rectangle(
+            *self._label_bg_coords(),
+            fill=color,
+            outline=color,
+            tags="bbox",
+        )
         self.label_id = self.canvas.create_text(
             self.box[0],
             self.box[1] - self.LABEL_OFFSET,
@@ -82,112 +128,128 @@ class BoundingBox:
             font=(self.label_font, self.label_font_size),
             tags="bbox",
         )
-        # create a filled rectangle behind the label
-        self.label_bg = self.canvas.create_rectangle(
-            *self.canvas.bbox(self.label_id),
-            fill=self.controller.get_class_color(self.class_uid),
-            outline=self.controller.get_class_color(self.class_uid),
-            tags="bbox",
-        )
-        self.canvas.tag_lower(self.label_bg, self.label_id)
+
+    def _measure_label(self, text: str) -> None:
+        """Measure the size of the label text, so that its background can be placed without asking the canvas.
+
+        The font is created once per family and size and shared by all bounding boxes.
+        """
+        key = (self.label_font, self.label_font_size)
+        font = _FONT_CACHE.get(key)
+        if font is None:
+            font = _FONT_CACHE[key] = tkfont.Font(
+                root=self.canvas, family=self.label_font, size=self.label_font_size
+            )
+        self._label_width = font.measure(text)
+        self._label_height = font.metrics("linespace")
+
+    def _label_bg_coords(self) -> tuple[int, int, int, int]:
+        """The coordinates of the rectangle behind the label, computed from the measured label size."""
+        x, y = self.box[0], self.box[1] - self.LABEL_OFFSET
+        return x, y, x + self._label_width, y + self._label_height
 
     def get_handle_at(self, x: int, y: int) -> str | None:
-        """Check if a handle is at the given coordinates."""
-        for pos, handle in self.handles.items():
-            bbox = self.canvas.bbox(handle)
-            if bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]:
+        """Check if a handle is at the given coordinates.
+
+        The handle positions are computed from the box instead of being queried from the canvas. The reach
+        includes the one pixel outline of the handles, which the canvas counts as part of them.
+        """
+        reach = self._half + 1
+        # most boxes are far from the click, which the extent of the box including its handles rules out
+        if not (
+            min(self.x1, self.x2) - reach <= x <= max(self.x1, self.x2) + reach
+            and min(self.y1, self.y2) - reach <= y <= max(self.y1, self.y2) + reach
+        ):
+            return None
+        for pos, (handle_x, handle_y) in zip(HANDLE_ORDER, self._handle_centers()):
+            if abs(x - handle_x) <= reach and abs(y - handle_y) <= reach:
                 return pos
         return None
 
+    def _handle_centers(self) -> tuple[tuple[float, float], ...]:
+        """The centers of the resize handles as (x, y), in the order of `HANDLE_ORDER`."""
+        x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+        center_x, center_y = (x1 + x2) // 2, (y1 + y2) // 2
+        return (
+            (x1, y1),
+            (x2, y1),
+            (x1, y2),
+            (x2, y2),
+            (center_x, y1),
+            (x2, center_y),
+            (center_x, y2),
+            (x1, center_y),
+        )
+
     def _create_handles(self):
         """Create the resize handles for the bounding box."""
-        center_positions = {
-            "nw": (self.x1, self.y1),
-            "ne": (self.x2, self.y1),
-            "sw": (self.x1, self.y2),
-            "se": (self.x2, self.y2),
-            "n": ((self.x1 + self.x2) / 2, self.y1),
-            "e": (self.x2, (self.y1 + self.y2) / 2),
-            "s": ((self.x1 + self.x2) / 2, self.y2),
-            "w": (self.x1, (self.y1 + self.y2) / 2),
-        }
-
-        for pos, (x, y) in center_positions.items():
+        color = self._class_color()
+        for pos, (x, y) in zip(HANDLE_ORDER, self._handle_centers()):
             handle = self.canvas.create_rectangle(
-                x - self.handle_size / 2,
-                y - self.handle_size / 2,
-                x + self.handle_size / 2,
-                y + self.handle_size / 2,
-                outline=self.controller.get_class_color(self.class_uid),
-                fill=self.controller.get_class_color(self.class_uid),
-                tags="handle",
+                x - self._half,
+                y - self._half,
+                x + self._half,
+                y + self._half,
+                outline=color,
+                fill=color,
+                tags=("handle", f"handle_{pos}"),
             )
             self.handles[pos] = handle
+        self._handle_ids = tuple(self.handles.values())
 
-            self.canvas.tag_bind(handle, "<Enter>", lambda event, pos=pos: self._change_cursor(event, pos))
-            self.canvas.tag_bind(handle, "<Leave>", lambda event: self._reset_cursor(event))
+        # the bindings of a tag outlive the boxes, so binding them per box would pile up on the canvas
+        if self.canvas not in _BOUND_CANVASES:
+            _BOUND_CANVASES.add(self.canvas)
+            for pos, cursor in RESIZE_CURSORS.items():
+                self.canvas.tag_bind(f"handle_{pos}", "<Enter>", partial(self._set_cursor, cursor))
+            self.canvas.tag_bind("handle", "<Leave>", partial(self._set_cursor, ""))
 
     def _update_handles(self):
-        """Update handle positions after resizing."""
-        positions = {
-            "nw": (self.x1, self.y1),
-            "ne": (self.x2, self.y1),
-            "sw": (self.x1, self.y2),
-            "se": (self.x2, self.y2),
-            "n": ((self.x1 + self.x2) / 2, self.y1),
-            "s": ((self.x1 + self.x2) / 2, self.y2),
-            "w": (self.x1, (self.y1 + self.y2) / 2),
-            "e": (self.x2, (self.y1 + self.y2) / 2),
-        }
-
-        for pos, (x, y) in positions.items():
-            self.canvas.coords(
-                self.handles[pos],
-                x - self.handle_size / 2,
-                y - self.handle_size / 2,
-                x + self.handle_size / 2,
-                y + self.handle_size / 2,
-            )
+        """Update handle positions after resizing.
 
-        # update the color of the handles, the bounding box and the label
-        self.canvas.itemconfig(self.rect, outline=self.controller.get_class_color(self.class_uid))
-        self.canvas.itemconfig(self.label_id, fill=self.label_color)
-        self.canvas.itemconfig(
-            self.label_bg,
-            fill=self.controller.get_class_color(self.class_uid),
-            outline=self.controller.get_class_color(self.class_uid),
-        )
+        Only the geometry is updated, as this runs on every mouse motion while resizing. The colors are
+        updated by `_update_class` when the class changes.
+        """
+        half = self._half
+        for handle, (x, y) in zip(self._handle_ids, self._handle_centers()):
+            self.canvas.coords(handle, x - half, y - half, x + half, y + half)
+
+    def _update_class(self):
+        """Update the label text and the colors of the handles, the bounding box and the label."""
+        color = self._class_color()
+        text = f"{self.id}: {self.label}" if self.id is not None else f"{self.label}"
+        self._measure_label(text)
+        self.canvas.itemconfig(self.label_id, text=text, fill=self.label_color)
+        self.canvas.itemconfig(self.rect, outline=color)
+        self.canvas.itemconfig(self.label_bg, fill=color, outline=color)
         for handle in self.handles.values():
-            self.canvas.itemconfig(
-                handle,
-                outline=self.controller.get_class_color(self.class_uid),
-                fill=self.controller.get_class_color(self.class_uid),
-            )
+            self.canvas.itemconfig(handle, outline=color, fill=color)
 
     def update(self, box):
-        """Update the bounding box with new coordinates."""
-        self.box = box
-        self.x1, self.y1, self.x2, self.y2 = box
-        self.canvas.coords(self.rect, *self.box)
-        self.canvas.coords(self.label_id, self.box[0], self.box[1] - self.LABEL_OFFSET)
+        """Update the bounding box with new coordinates.
 
-        # update the label text
-        text = f"{self.id}: {self.label}" if self.id is not None else f"{self.label}"
-        self.canvas.itemconfig(self.label_id, text=text)
+        Nothing is redrawn if neither the coordinates nor the class have changed.
+        """
+        moved = box != self.box
+        if moved:
+            self.box = box
+            self.x1, self.y1, self.x2, self.y2 = box
+            self.canvas.coords(self.rect, *self.box)
+            self.canvas.coords(self.label_id, self.box[0], self.box[1] - self.LABEL_OFFSET)
+            self._update_handles()
 
-        self.canvas.coords(self.label_bg, *self.canvas.bbox(self.label_id))
-        self._update_handles()
+        # the label text and the colors only change with the class, not while resizing
+        relabeled = self.class_uid != self._color_uid
+        if relabeled:
+            self._update_class()
 
-    def _change_cursor(self, event, pos):
-        """Change the cursor when hovering over a resize handle."""
-        try:
-            self.canvas.config(cursor=RESIZE_CURSORS[pos])
-        except TclError:
-            self.canvas.config(cursor="")
+        if moved or relabeled:
+            self.canvas.coords(self.label_bg, *self._label_bg_coords())
 
-    def _reset_cursor(self, event):
-        """Reset the cursor when leaving a resize handle."""
-        self.canvas.config(cursor="")
+    @staticmethod
+    def _set_cursor(cursor: str, event):
+        """Change the cursor when entering or leaving a resize handle."""
+        event.widget.config(cursor=cursor)
 
     def start_resize(self, event, pos):
         """Start resizing the bounding box."""
@@ -200,6 +262,9 @@ class BoundingBox:
     def resize(self, x, y):
         """Resize the bounding box.
 
+        The box is redrawn when Tk is idle, so that mouse motions arriving faster than they can be drawn are
+        coalesced into a single redraw.
+
         Args:
             x: The x-coordinate of the mouse on the canvas.
             y: The y-coordinate of the mouse on the canvas.
@@ -207,34 +272,38 @@ class BoundingBox:
         if not self.resizing:
             return
 
-        if self.active_handle == "nw":
-            self.x1 = x
-            self.y1 = y
-        elif self.active_handle == "ne":
-            self.x2 = x
-            self.y1 = y
-        elif self.active_handle == "sw":
+        self._pending_resize = (x, y)
+        if self._resize_job is None:
+            self._resize_job = self.canvas.after_idle(self._flush_resize)
+
+    def _flush_resize(self):
+        """Apply the latest mouse position passed to `resize` since the last redraw."""
+        self._resize_job = None
+        if self._pending_resize is None or self.active_handle is None:
+            return
+        x, y = self._pending_resize
+        self._pending_resize = None
+
+        move_x1, move_y1, move_x2, move_y2 = RESIZE_EDGES[self.active_handle]
+        if move_x1:
             self.x1 = x
-            self.y2 = y
-        elif self.active_handle == "se":
-            self.x2 = x
-            self.y2 = y
-        elif self.active_handle == "n":
+        if move_y1:
             self.y1 = y
-        elif self.active_handle == "e":
+        if move_x2:
             self.x2 = x
-        elif self.active_handle == "s":
+        if move_y2:
             self.y2 = y
-        elif self.active_handle == "w":
-            self.x1 = x
 
-        self.box = (self.x1, self.y1, self.x2, self.y2)
-        self.update(self.box)
+        # a side handle also receives motion along the axis it does not resize, `update` skips these
+        self.update((self.x1, self.y1, self.x2, self.y2))
 
     def end_resize(self):
         """End resizing the bounding box."""
-        if hasattr(self, "active_handle"):
-            del self.active_handle
+        # the box must have its final size before the callback reads it
+        if self._resize_job is not None:
+            self.canvas.after_cancel(self._resize_job)
+            self._flush_resize()
+        self.active_handle = None
         if not self.resizing:
             return
         self.resizing = False
@@ -25,11 +25,50 @@ class ImageContent(ImageTk.PhotoImage):
         self.image = self.original_image.copy().resize((self.img_width, self.img_height))
 
         super().__init__(self.image, **kwargs)
+        self.photo_mode = self._photo_mode(self.image)
 
         # zooming parameters
         self.zoom_level: float = 1.0
         self.zoom_center: tuple = (self.img_width // 2, self.img_height // 2)
 
+    def load(self, image_path: str, available_size: tuple[int, int]) -> bool:
+        """Show a different image, reusing the existing photo image if possible.
+
+        The pixels are pasted into the existing photo image, which is only possible if the new image fits into
+        the available space with the same size as the current image and has the same mode. Pasting converts
+        the pixels to the mode of the photo image, e.g. a color image would be shown in grayscale.
+
+        Args:
+            image_path: The path to the new image file.
+            available_size: The available size of the image content area.
+
+        Returns:
+            Whether the image has been replaced. If not, a new `ImageContent` has to be created.
+        """
+        original_image = Image.open(image_path)
+        self.available_width, self.available_height = available_size
+        if (
+            self.calc_fit_size(original_image.size) != (self.img_width, self.img_height)
+            or self._photo_mode(original_image) != self.photo_mode
+        ):
+            original_image.close()
+            return False
+
+        self.original_image = original_image
+        self.image = self.original_image.resize((self.img_width, self.img_height))
+        self.paste(self.image)
+
+        self.zoom_level = 1.0
+        self.zoom_center = (self.img_width // 2, self.img_height // 2)
+        return True
+
+    @staticmethod
+    def _photo_mode(image: Image.Image) -> str:
+        """The mode in which `ImageTk.PhotoImage` stores the given image."""
+        if image.mode == "P":
+            return image.palette.mode if image.palette else "RGB"
+        return image.mode if image.mode in ("1", "L", "RGB", "RGBA") else Image.getmodebase(image.mode)
+
     def calc_fit_size(self, image_size: tuple[int, int]) -> tuple[int, int]:
         """Calculate the size of the image to fit the available space.
 
@@ -165,6 +204,8 @@ class Content(ctk.CTkFrame):
         self.state = self.EventState.IDLE
 
         self.image_content: ImageContent
+        # a single persistent image item, the displayed image is swapped in place
+        self._image_item = self.canvas.create_image(0, 0, anchor="nw")
         self.bboxes: list[BoundingBox] = []
         self.new_image()
         self._create_bounding_boxes()
@@ -189,17 +230,24 @@ class Content(ctk.CTkFrame):
             if not current_img:
                 raise Exception("No image available to load.")
 
-            self.image_content = ImageContent(current_img.path, (self.available_width, self.available_height))
-            self.canvas.config(width=self.image_content.img_width, height=self.image_content.img_height)
-            self.canvas.create_image(0, 0, anchor="nw", image=self.image_content)
-            self.canvas.lower(self.image_content)
+            available_size = (self.available_width, self.available_height)
+            # images of the same display size are pasted into the existing photo image
+            if not (
+                hasattr(self, "image_content") and self.image_content.load(current_img.path, available_size)
+            ):
+                self.image_content = ImageContent(current_img.path, available_size)
+                self.canvas.config(width=self.image_content.img_width, height=self.image_content.img_height)
+            # the image is also attached when pasted, as it is detached from the item if loading fails
+            self.canvas.itemconfigure(self._image_item, image=self.image_content)
+            self.canvas.tag_lower(self._image_item)
 
         except Exception as e:
             if current_img:
                 print(f"Failed to load image {current_img.path}: {e}")
             else:
                 print("No image available to load.")
-            self.canvas.delete("all")
+            self.canvas.itemconfigure(self._image_item, image="")
+            self.canvas.delete("bbox", "handle")
 
     def relative_to_canvas_coords(
         self, box: tuple[float, float, float, float]
@@ -15,26 +15,62 @@ class Controller:
     """The controller for the annotator application.
 
     Args:
-        store: The annotation store object to use for image data.
+        classes: The class store or a list of class names or class dictionaries.
+        detection_model: The object detection model to use for automatic annotation.
+        initial_images: A list of `SingleImage` or image paths to start with.
+        batch_size: The number of images to pass to the detection model at once.
+        background: Whether to run the detection model on a background thread, so that the view does not
+            block while images are annotated automatically.
+        cache_detections: Whether to cache the automatic annotations next to the images, so that they are not
+            detected again in the next session.
+        force_reannotate: Whether to ignore the cached annotations and detect the images again.
 
     Note:
     - It is required to set the view for the controller using the `set_view` method.
     """
 
+    POLL_INTERVAL = 20
+
     def __init__(
         self,
         classes: ClassesStore | list[str] | list[dict[str, str]],
         detection_model: DetectionModel,
         initial_images: list[SingleImage | str] = [],
+        batch_size: int = 1,
+        background: bool = False,
+        cache_detections: bool = False,
+        force_reannotate: bool = False,
     ):
         self._class_store = classes if isinstance(classes, ClassesStore) else ClassesStore(classes)
-        self._img_store = ImageStore(self._class_store, detection_model, initial_images)
+        self._img_store = ImageStore(
+            self._class_store,
+            detection_model,
+            initial_images,
+            batch_size,
+            background,
+            cache_detections,
+            force_reannotate,
+        )
+        self._background = background
 
         self._view: UI
 
     def set_view(self, view: UI) -> None:
         """Set the view for the controller."""
         self._view = view
+        if self._background:
+            self.poll_detections()
+
+    def poll_detections(self) -> None:
+        """Apply finished background detections and schedule the next poll on the view's event loop.
+
+        While the view is busy, e.g. the user is drawing a box, the detections are left for a later poll, as
+        redrawing the boxes would discard the box being drawn.
+        """
+        if not self._view.is_busy() and self._img_store.collect_detections():
+            self._view.redraw_content(only_boxes=True)  # type: ignore
+            self._view.refresh_right_sidebar()
+        self._view.after(self.POLL_INTERVAL, self.poll_detections)
 
     def classes_store(self) -> ClassesStore:
         """The class store for the dataset."""
@@ -20,3 +20,36 @@ class DetectionModel(ABC):
             detection confidence.
         """
         raise NotImplementedError
+
+    def predict_batch(self, imgs: list[Image.Image]):
+        """Detect objects in a batch of images and return the results.
+
+        The default implementation processes the images one at a time. Models that support batched inference
+        should override this method.
+
+        Args:
+            imgs: The images to process.
+
+        Returns:
+            A list containing one result per image, each in the format returned by `__call__`.
+        """
+        return [self(img) for img in imgs]
+
+    def draft(self, img: Image.Image) -> None:
+        """Configure the image decoder before the image is loaded.
+
+        Models that downscale their input can use this to let the decoder produce a smaller image directly.
+        The default implementation does nothing.
+
+        Args:
+            img: The image that has been opened but not loaded yet.
+        """
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the model and the settings that affect its detections.
+
+        Cached detections are only reused by a model with the same fingerprint. Models should include e.g.
+        their weights and the labels they detect. The default implementation only uses the class name.
+        """
+        return type(self).__name__
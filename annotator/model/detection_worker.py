@@ -0,0 +1,107 @@
+"""A worker for running an object detection model on background threads."""
+
+import queue
+import threading
+from uuid import UUID
+
+from PIL import Image
+
+from annotator.model.base_model import DetectionModel
+
+
+class DetectionWorker:
+    """A worker for running an object detection model on background threads.
+
+    Images are submitted by path and the results can be collected without blocking. Images that can not be
+    loaded or detected are reported with `None` instead of detections, so that they can be submitted again.
+    Loading and decoding the images runs on a separate thread from the detection itself, so that disk access
+    overlaps with inference.
+    The results queue is the only point of contact with the collecting thread, so all annotation state and all
+    widgets are only ever modified by the thread that collects the results.
+
+    Args:
+        model: The object detection model to use.
+        batch_size: The maximum number of pending images to pass to the model at once.
+        maxsize: The maximum number of results that are kept before the worker waits for them to be collected.
+    """
+
+    def __init__(self, model: DetectionModel, batch_size: int = 1, maxsize: int = 4):
+        self._model = model
+        self._batch_size = batch_size
+        self._requests: queue.Queue[tuple[UUID, str]] = queue.Queue()
+        self._decoded: queue.Queue[tuple[UUID, Image.Image]] = queue.Queue(maxsize=2 * batch_size)
+        self._results: queue.Queue[tuple[UUID, list[dict] | None]] = queue.Queue(maxsize=maxsize)
+        self._io_thread = threading.Thread(target=self._load, daemon=True)
+        self._infer_thread = threading.Thread(target=self._infer, daemon=True)
+        self._io_thread.start()
+        self._infer_thread.start()
+
+    def submit(self, uuid: UUID, path: str) -> None:
+        """Submit an image for detection.
+
+        Args:
+            uuid: The unique identifier of the image, used to match the result to the image.
+            path: The path to the image file.
+        """
+        self._requests.put((uuid, path))
+
+    def collect(self) -> list[tuple[UUID, list[dict] | None]]:
+        """Collect all results that are available without blocking.
+
+        Returns:
+            A list of tuples containing the unique identifier of an image and its detections, or `None` if the
+            detection failed.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def _load(self) -> None:
+        """Open and decode submitted images until the program exits."""
+        while True:
+            uuid, path = self._requests.get()
+            try:
+                img = Image.open(path)
+            except Exception as e:
+                print(f"Failed to initialize image: {e}")
+                self._results.put((uuid, None))
+                continue
+            try:
+                self._model.draft(img)
+                img.load()
+            except Exception as e:
+                print(f"Failed to initialize image: {e}")
+                img.close()
+                self._results.put((uuid, None))
+                continue
+            self._decoded.put((uuid, img))
+
+    def _next_batch(self) -> list[tuple[UUID, Image.Image]]:
+        """Wait for the next decoded image and add all further decoded images up to the batch size."""
+        batch = [self._decoded.get()]
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._decoded.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _infer(self) -> None:
+        """Run the detection model on decoded images until the program exits."""
+        while True:
+            batch = self._next_batch()
+            results: list[list[dict] | None]
+            try:
+                results = list(self._model.predict_batch([img for _, img in batch]))
+            except Exception as e:
+                print(f"Failed to initialize images: {e}")
+                results = [None] * len(batch)
+            finally:
+                for _, img in batch:
+                    img.close()
+
+            for (uuid, _), res in zip(batch, results):
+                self._results.put((uuid, res))
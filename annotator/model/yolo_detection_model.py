@@ -1,5 +1,10 @@
 """A class for object detection using a YOLO model."""
 
+import os
+import tempfile
+from pathlib import Path
+
+import yaml
 from PIL import Image
 
 from annotator.model.base_model import DetectionModel
@@ -18,13 +23,170 @@ class YOLODetectionModel(DetectionModel):
     Args:
         model: The PyTorch model to use for object detection.
         available_labels: A list of available class labels.
-        input_size: The size to which to resize the input images.
+        input_size: The inference size of the model as (width, height).
+        export_format: If given, the model is exported to this format (e.g. "engine" for TensorRT, "onnx" or
+            "openvino") once and the exported model is used for all detections.
+        batch_size: The maximum number of images passed to the model at once. Exported models are exported for
+            this batch size and larger batches are split into chunks of it, compiled models are warmed up with
+            it.
+        precision: The precision of the exported model, one of "auto", "fp32", "fp16" or "int8". With "auto",
+            TensorRT engines use FP16 on CUDA devices and OpenVINO models use INT8 on CPU-only hosts, if
+            calibration images are given. Otherwise the model is exported in FP32.
+        calibration_images: Paths of images used to calibrate an INT8 export, e.g. the images to annotate.
+            At most `MAX_CALIBRATION_IMAGES` of them are used. If None, an explicit "int8" export is
+            calibrated on the default dataset of ultralytics, which is downloaded if necessary.
+        compile_model: Whether to fuse the Conv and BatchNorm layers of the PyTorch model and compile it with
+            `torch.compile` on CUDA devices. Only applies if the model is not exported. A single blank image
+            and a full batch of them are detected at startup, so that the compilation does not delay the first
+            real detections.
     """
 
-    def __init__(self, model, available_labels: list[str], input_size: tuple[int, int] = (640, 640)):
+    EXPORT_SUFFIXES = {"engine": ".engine", "onnx": ".onnx", "openvino": "_openvino_model"}
+    INT8_FORMATS = ("engine", "openvino")
+    MAX_CALIBRATION_IMAGES = 100
+
+    def __init__(
+        self,
+        model,
+        available_labels: list[str],
+        input_size: tuple[int, int] = (640, 640),
+        export_format: str | None = None,
+        batch_size: int = 1,
+        precision: str = "auto",
+        calibration_images: list[str] | None = None,
+        compile_model: bool = False,
+    ):
+        # torch is imported where it is needed, so that the module can be imported without it
+        import torch
+
+        cuda = torch.cuda.is_available()
+        if export_format is not None:
+            model = self._load_exported(
+                model, export_format, input_size, batch_size, precision, calibration_images, cuda
+            )
         self.model = model
         self.available_labels = available_labels
         self.input_size = input_size
+        self._device = 0 if cuda else "cpu"
+        # the precision of exported models is fixed at export time
+        self._half = export_format is None and cuda
+        # exported models only accept batches up to the batch size they were exported for
+        self._max_batch = batch_size if export_format is not None else None
+
+        if compile_model and export_format is None:
+            self.model.fuse()
+            if cuda:
+                self.model.model = torch.compile(self.model.model, mode="reduce-overhead")
+            blank = Image.new("RGB", self.input_size)
+            for n in sorted({1, batch_size}):
+                self.predict_batch([blank] * n)
+
+    @property
+    def available_labels(self) -> list[str]:
+        """The class labels that are kept in the detections, all other labels are replaced by "none"."""
+        return self._available_labels
+
+    @available_labels.setter
+    def available_labels(self, labels: list[str]) -> None:
+        self._available_labels = labels
+        self._label_set = frozenset(labels)
+
+    @property
+    def fingerprint(self) -> str:
+        """The weights with their modification time, the input size and the available labels."""
+        weights = getattr(self.model, "ckpt_path", None) or getattr(self.model, "model_name", None)
+        mtime = os.stat(weights).st_mtime_ns if isinstance(weights, str) and os.path.exists(weights) else 0
+        labels = ",".join(sorted(self._available_labels))
+        return f"{type(self).__name__}:{weights}:{mtime}:{self.input_size[0]}x{self.input_size[1]}:{labels}"
+
+    @classmethod
+    def _load_exported(
+        cls,
+        model,
+        export_format: str,
+        input_size: tuple[int, int],
+        batch_size: int,
+        precision: str,
+        calibration_images: list[str] | None,
+        cuda: bool,
+    ):
+        """Export the model to the given format and load the exported model.
+
+        The exported model is cached next to the original weights, keyed by input size, batch size and
+        precision, so that subsequent runs skip the export. Half precision is only used on CUDA devices. If an
+        INT8 export fails, e.g. because the platform does not support it, the model is exported in FP32.
+
+        Raises:
+            ValueError: If the export format or the precision is not supported.
+        """
+        from ultralytics import YOLO
+
+        if export_format not in cls.EXPORT_SUFFIXES:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if precision not in ("auto", "fp32", "fp16", "int8"):
+            raise ValueError(f"Unsupported precision: {precision}")
+        if precision == "int8" and export_format not in cls.INT8_FORMATS:
+            raise ValueError(f"INT8 is not supported for export format: {export_format}")
+
+        if precision == "auto":
+            if export_format == "engine" and cuda:
+                precision = "fp16"
+            elif export_format == "openvino" and not cuda and calibration_images:
+                # without calibration images, ultralytics would download its default dataset to calibrate on
+                precision = "int8"
+            else:
+                precision = "fp32"
+        elif precision == "fp16" and not cuda:
+            precision = "fp32"
+
+        def export(precision: str) -> Path:
+            weights = Path(model.ckpt_path)
+            cached = weights.with_name(
+                f"{weights.stem}_{input_size[0]}x{input_size[1]}_b{batch_size}_{precision}"
+                f"{cls.EXPORT_SUFFIXES[export_format]}"
+            )
+            if cached.exists():
+                return cached
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                data = (
+                    cls._write_calibration_data(calibration_images, model.names, tmp_dir)
+                    if precision == "int8" and calibration_images
+                    else None
+                )
+                exported = model.export(
+                    format=export_format,
+                    imgsz=(input_size[1], input_size[0]),
+                    half=precision == "fp16",
+                    int8=precision == "int8",
+                    batch=batch_size,
+                    dynamic=batch_size > 1,
+                    device=0 if cuda else "cpu",
+                    **({"data": data} if data is not None else {}),
+                )
+            os.replace(exported, cached)
+            return cached
+
+        if precision == "int8":
+            try:
+                return YOLO(str(export("int8")), task="detect")
+            except Exception as e:
+                print(f"INT8 export failed, falling back to FP32: {e}")
+                precision = "fp32"
+
+        return YOLO(str(export(precision)), task="detect")
+
+    @classmethod
+    def _write_calibration_data(cls, images: list[str], names: dict[int, str], directory: str) -> str:
+        """Write a dataset config for INT8 calibration to the given directory and return its path."""
+        image_list = os.path.join(directory, "images.txt")
+        with open(image_list, "w") as f:
+            f.write("".join(f"{os.path.abspath(img)}\n" for img in images[: cls.MAX_CALIBRATION_IMAGES]))
+
+        data_path = os.path.join(directory, "data.yaml")
+        with open(data_path, "w") as f:
+            yaml.dump({"train": image_list, "val": image_list, "names": dict(names)}, f, sort_keys=False)
+        return data_path
 
     def __call__(self, img: Image.Image):
         """Detect objects in a single image and return the results as a list of dictionaries.
@@ -37,26 +199,59 @@ class YOLODetectionModel(DetectionModel):
             for the normalized bounding box coordinates, 'label' for the class label, and 'confidence' for the
             detection confidence.
         """
-        img = img.resize(self.input_size)
-        results = self.model(img)[0]
-        labels = results.names
-        boxes = results.boxes
-        res = []
-        for box in boxes:
-            label = labels[box.cls.item()]
-            if label not in self.available_labels:
-                label = "none"
-
-            # convert [x1, y1, x2, y2] to [center_x, center_y, width, height], all normalized to [0, 1]
-            boxn = box.xyxyn[0].tolist()
-            boxn = [(boxn[0] + boxn[2]) / 2, (boxn[1] + boxn[3]) / 2, boxn[2] - boxn[0], boxn[3] - boxn[1]]
-
-            res.append(
-                {
-                    "box": box.xyxy[0].tolist(),
-                    "boxn": boxn,
-                    "label": label,
-                    "confidence": box.conf.item(),
-                }
-            )
-        return res
+        return self.predict_batch([img])[0]
+
+    def predict_batch(self, imgs: list[Image.Image]):
+        """Detect objects in a batch of images using a single forward pass of the model.
+
+        Args:
+            imgs: The images to process.
+
+        Returns:
+            A list containing one result per image, each in the format returned by `__call__`.
+        """
+        import torch
+
+        # the model letterboxes the images to the input size itself, so they are not resized beforehand
+        for img in imgs:
+            self.draft(img)
+        imgs = [img if img.mode == "RGB" else img.convert("RGB") for img in imgs]
+        step = self._max_batch or max(len(imgs), 1)
+
+        parsed: list[list[dict]] = []
+        with torch.inference_mode():
+            for i in range(0, len(imgs), step):
+                results = self.model.predict(
+                    imgs[i : i + step],
+                    imgsz=(self.input_size[1], self.input_size[0]),
+                    half=self._half,
+                    device=self._device,
+                    stream=True,
+                    verbose=False,
+                )
+                parsed.extend(self._parse_result(result) for result in results)
+        return parsed
+
+    def draft(self, img: Image.Image) -> None:
+        """Let the JPEG decoder downscale the image to roughly the input size while decoding it."""
+        img.draft("RGB", self.input_size)
+
+    def _parse_result(self, results):
+        """Convert the model output for a single image to a list of dictionaries.
+
+        All box attributes are transferred from the device in one call each, instead of once per box.
+        """
+        xyxy = results.boxes.xyxy.cpu().tolist()
+        # xywhn already holds [center_x, center_y, width, height] normalized to [0, 1] for all boxes
+        xywhn = results.boxes.xywhn.cpu().tolist()
+        classes = results.boxes.cls.int().cpu().tolist()
+        confidences = results.boxes.conf.cpu().tolist()
+
+        # resolve each detected class once per image instead of once per box
+        labels = {cls: results.names[cls] for cls in set(classes)}
+        labels = {cls: label if label in self._label_set else "none" for cls, label in labels.items()}
+
+        return [
+            {"box": box, "boxn": boxn, "label": labels[cls], "confidence": conf}
+            for box, boxn, cls, conf in zip(xyxy, xywhn, classes, confidences)
+        ]
@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from tkinter import filedialog
 from uuid import UUID
 
@@ -111,31 +111,44 @@ class LeftSidebarList(ctk.CTkScrollableFrame):
             self.list_items.append(button)
 
     def update(self) -> None:
-        """Update the left sidebar list items."""
-        if len(self.list_items) == len(self.controller.image_names()):
-            for list_item in self.list_items:
-                list_item.update(
-                    active=list_item.uuid == self.controller.active_uuid(),
-                    ready=self.controller.is_ready(list_item.uuid),
-                )
+        """Update the left sidebar list items.
+
+        If images have only been appended to the store, items are added for them and the existing items are
+        kept. Otherwise, the list is rebuilt.
+        """
+        images = list(self.controller.image_store())
+        if len(self.list_items) <= len(images) and all(
+            item.uuid == img.uuid for item, img in zip(self.list_items, images)
+        ):
+            new_images = images[len(self.list_items) :]
+            self.add_items([img.name for img in new_images], [img.uuid for img in new_images])
+            # the items are in the same order as the images, so no lookup by UUID is needed
+            active_uuid = self.controller.active_uuid()
+            for list_item, img in zip(self.list_items, images):
+                list_item.update(active=img.uuid == active_uuid, ready=img.ready)
         else:
             for item in self.list_items:
                 item.destroy()
             self.setup()
 
     def add_items(self, names: list[str], uuids: list[UUID]) -> None:
-        """Add items to the left sidebar list.
+        """Add items to the left sidebar list. Images that are already listed are skipped.
 
         Args:
             names: A list of file names to add.
-            idx: A list of indices to add.
+            uuids: A list of unique identifiers of the images to add.
         """
+        listed = {item.uuid for item in self.list_items}
+        active_uuid = self.controller.active_uuid()
         for uuid, name in zip(uuids, names):
+            if uuid in listed:
+                continue
+            listed.add(uuid)
             button = ListItem(
                 self,
                 text=name,
                 command=lambda uuid=uuid: self.controller.jump_to(uuid),
-                active=uuid == self.controller.active_uuid(),
+                active=uuid == active_uuid,
                 ready=self.controller.is_ready(uuid),
                 uuid=uuid,
             )
@@ -151,7 +164,7 @@ class LeftSidebar(ctk.CTkFrame):
         controller: The controller object.
     """
 
-    EXTENSIONS = [".jpg", ".jpeg", ".png", ".bmp", ".gif"]
+    EXTENSIONS = [".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp"]
 
     def __init__(self, master, controller: Controller, **kwargs) -> None:
         super().__init__(master, **kwargs)
@@ -205,7 +218,7 @@ class LeftSidebar(ctk.CTkFrame):
         """
         files = filedialog.askopenfilenames(
             title="Select Image(s)",
-            filetypes=[("Image Files", "*.jpg *.jpeg *.png *.bmp *.gif")],
+            filetypes=[("Image Files", "*.jpg *.jpeg *.png *.bmp *.gif *.webp")],
         )
         self._add_images(list(files))
 
@@ -215,7 +228,10 @@ class LeftSidebar(ctk.CTkFrame):
         Opens a file dialog to select a directory of images.
         """
         directory = filedialog.askdirectory(title="Select Directory")
-        images = self.find_all_images(directory, self.EXTENSIONS)
+        if not directory:
+            return
+        # sorted, so the images are listed and prefetched in a stable order that follows the directory layout
+        images = sorted(self.find_all_images(directory, self.EXTENSIONS))
         self._add_images(images)
 
     def _add_images(self, files: list[str]) -> None:
@@ -227,22 +243,23 @@ class LeftSidebar(ctk.CTkFrame):
         added_uuids = self.controller.add_images(files)
         self.list.add_items([os.path.basename(file) for file in files], added_uuids)
 
-    def find_all_images(self, root_dir: str, extensions: list[str]) -> list[str]:
+    def find_all_images(self, root_dir: str, extensions: list[str]) -> Iterator[str]:
         """Find all images in a directory and its subdirectories.
 
+        The directory tree is scanned lazily, using the file type information cached by `os.scandir`. Like
+        `os.walk`, symbolic links to directories are not followed, so that link loops do not recurse forever.
+
         Args:
             root_dir: The root directory to search.
             extensions: A list of image file extensions to search for.
 
-        Returns:
-            A list of image file paths.
+        Yields:
+            The image file paths.
         """
-        # add all images in the root directory to the list, for all subdirectories, call function recursively
-        image_paths = []
-        for root, dirs, files in os.walk(root_dir):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in extensions):
-                    image_paths.append(os.path.join(root, file))
-            for dir in dirs:
-                image_paths.extend(self.find_all_images(os.path.join(root, dir), extensions))
-        return image_paths
+        suffixes = tuple(extensions)
+        with os.scandir(root_dir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self.find_all_images(entry.path, extensions)
+                elif entry.is_file() and entry.name.lower().endswith(suffixes):
+                    yield entry.path
@@ -1,5 +1,7 @@
 """Right sidebar for the annotator GUI."""
 
+from functools import partial
+
 import customtkinter as ctk
 
 from annotator.controller import Controller
@@ -17,39 +19,47 @@ class RightSidebarList(ctk.CTkScrollableFrame):
     def __init__(self, master, controller: Controller, **kwargs) -> None:
         super().__init__(master, **kwargs)
         self.controller = controller
+        self._rows: list[ctk.CTkFrame] = []
+        self._label_options: list[ctk.CTkComboBox] = []
         self.update()
 
     def update(self) -> None:
-        """Update the list of labels in the sidebar."""
-        for widget in self.winfo_children():
-            widget.destroy()
+        """Update the list of labels in the sidebar.
 
+        Rows are kept between updates and only reconfigured, rows that are not needed are hidden.
+        """
         current_img = self.controller.current()
-        if current_img is None:
-            return
-
-        for i, label_uid in enumerate(current_img.label_uids):
-            label = self.controller.get_class_name(label_uid)
-
-            # add ComboBox for each label
-            frame = ctk.CTkFrame(self, fg_color=self.cget("fg_color"))
-            frame.pack(fill="x", pady=5, padx=5)
-
-            id_label = ctk.CTkLabel(frame, text=f"{i}.")
-            id_label.pack(side="left", fill="x", expand=True, padx=(0, 5))
-
-            # Add ComboBox for each label inside the frame
-            label_option = ctk.CTkComboBox(
-                frame,
-                values=self.controller.available_labels(),
-                command=lambda choice, idx=i: self.change_label(choice, idx),
-            )
-            label_option.set(label)
-            label_option.pack(side="left", fill="x", expand=True)  # Pack to the left and allow expansion
-
-            # Add a delete button next to the ComboBox
-            del_button = ctk.CTkButton(frame, text="X", width=10, command=lambda idx=i: self.delete(idx))
-            del_button.pack(side="right", padx=(10, 0))  # Pack to the right of the ComboBox
+        label_uids = current_img.label_uids if current_img is not None else []
+
+        while len(self._rows) < len(label_uids):
+            self._create_row(len(self._rows))
+
+        available_labels = self.controller.available_labels()
+        for i, (frame, label_option) in enumerate(zip(self._rows, self._label_options)):
+            if i < len(label_uids):
+                label_option.configure(values=available_labels)
+                label_option.set(self.controller.get_class_name(label_uids[i]))
+                frame.pack(fill="x", pady=5, padx=5)
+            else:
+                frame.pack_forget()
+
+    def _create_row(self, idx: int) -> None:
+        """Create the row for the label at the given index."""
+        frame = ctk.CTkFrame(self, fg_color=self.cget("fg_color"))
+
+        id_label = ctk.CTkLabel(frame, text=f"{idx}.")
+        id_label.pack(side="left", fill="x", expand=True, padx=(0, 5))
+
+        # Add ComboBox for the label inside the frame
+        label_option = ctk.CTkComboBox(frame, command=partial(self.change_label, idx=idx))
+        label_option.pack(side="left", fill="x", expand=True)  # Pack to the left and allow expansion
+
+        # Add a delete button next to the ComboBox
+        del_button = ctk.CTkButton(frame, text="X", width=10, command=partial(self.delete, idx))
+        del_button.pack(side="right", padx=(10, 0))  # Pack to the right of the ComboBox
+
+        self._rows.append(frame)
+        self._label_options.append(label_option)
 
     def change_label(self, label: str, idx: int) -> None:
         """Change the label for the given index."""
@@ -1,10 +1,15 @@
 """Thid module contains functions for exporting annotations to different formats."""
 
+import csv
+import importlib
 import json
 import os
 import random
-from io import TextIOWrapper
-from typing import Literal
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from io import BufferedWriter
+from types import ModuleType
+from typing import Any, Literal
 
 import yaml
 from PIL import Image
@@ -13,6 +18,13 @@ from annotator.store.classes_store import ClassesStore
 from annotator.store.image_store import ImageStore
 from annotator.store.single_image import SingleImage
 
+# orjson is an optional dependency, see the `fast` extra
+orjson: ModuleType | None
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 def export(
     path: str,
@@ -77,41 +89,55 @@ def _export_csv(
     if not path.endswith(".csv"):
         raise ValueError("Export path must be a CSV file.")
 
-    def process(data: list[SingleImage], file: TextIOWrapper, split: Literal["train", "test"]):
+    def process(data: list[SingleImage], writer, split: Literal["train", "test"]):
         for annotation in data:
-            for box, label_uid in zip(annotation.boxes, annotation.label_uids):
-                label = class_store.get_name(label_uid)
-                center_x, center_y, width, height = box
-                file.write(
-                    f"{annotation.path}{delimiter}{annotation.name}{delimiter}{center_x}{delimiter} \
-                    {center_y}{delimiter}{width}{delimiter}{height}{delimiter}{label}{delimiter}{split}\n"
-                )
-
-    with open(path, "w") as f:
-        f.write(
-            f"path{delimiter}file_name{delimiter}center_x{delimiter}center_y{delimiter}width{delimiter}height{delimiter}label{delimiter}split\n"
-        )
-        process(train, f, "train")
-        process(test, f, "test")
+            writer.writerows(
+                (annotation.path, annotation.name, *box, class_store.get_name(label_uid), split)
+                for box, label_uid in zip(annotation.boxes, annotation.label_uids)
+            )
+
+    with open(path, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+        writer.writerow(["path", "file_name", "center_x", "center_y", "width", "height", "label", "split"])
+        process(train, writer, "train")
+        process(test, writer, "test")
 
 
 def _export_json(path: str, train: list[SingleImage], test: list[SingleImage], class_store: ClassesStore):
     """Export the annotations to a JSON file.
 
+    The annotations are written one image at a time, so the whole output is never held in memory at once.
+
     Args:
         path: The path to the output JSON file.
-        data: The list of annotations to export.
+        train: The list of annotations to use for training.
+        test: The list of annotations to use for testing.
+        class_store: The class store containing the class labels.
     """
     if not path.endswith(".json"):
         raise ValueError("Export path must be a JSON file.")
 
-    train_json = [a.to_dict() for a in train]
-    test_json = [a.to_dict() for a in test]
+    def process(data: list[SingleImage], file: BufferedWriter):
+        file.write(b"[")
+        for i, annotation in enumerate(data):
+            file.write(b",\n        " if i else b"\n        ")
+            file.write(_dumps(annotation.to_dict()))
+        file.write(b"\n    ]" if data else b"]")
+
+    with open(path, "wb") as f:
+        f.write(b'{\n    "class_mapping": ' + _dumps(class_store.classes) + b',\n    "train": ')
+        process(train, f)
+        f.write(b',\n    "test": ')
+        process(test, f)
+        f.write(b"\n}\n")
 
-    output = {"class_mapping": class_store.classes, "train": train_json, "test": test_json}
 
-    with open(path, "w") as f:
-        json.dump(output, f, indent=4)
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON, using the faster `orjson` if it is installed."""
+    if orjson is not None:
+        data: bytes = orjson.dumps(obj)
+        return data
+    return json.dumps(obj).encode()
 
 
 def _export_yolo(path: str, train: list[SingleImage], test: list[SingleImage], class_store: ClassesStore):
@@ -131,40 +157,83 @@ def _export_yolo(path: str, train: list[SingleImage], test: list[SingleImage], c
     os.makedirs(os.path.join(path, "test", "images"), exist_ok=True)
     os.makedirs(os.path.join(path, "test", "labels"), exist_ok=True)
 
-    _process_yolo(path, train, class_store, "train")
-    _process_yolo(path, test, class_store, "test")
+    # map each class to its index once for both splits
+    label_idx = {uid: i for i, uid in enumerate(class_store.get_class_uids())}
+    _process_yolo(path, train, label_idx, "train")
+    _process_yolo(path, test, label_idx, "test")
 
     # create a yaml config file
+    names = class_store.get_class_names()
     data_yaml = {
         "train": "../train/images",
         "test": "../test/images",
-        "nc": len(class_store.get_class_names()),
-        "names": {i: label for i, label in enumerate(class_store.get_class_names())},
+        "nc": len(names),
+        "names": {i: label for i, label in enumerate(names)},
     }
 
     with open(os.path.join(path, "data.yaml"), "w") as f:
         yaml.dump(data_yaml, f, default_flow_style=False, sort_keys=False)
 
 
-def _process_yolo(path: str, raw_data: list[SingleImage], class_store: ClassesStore, split: str):
+def _process_yolo(path: str, raw_data: list[SingleImage], label_idx: dict[int, int], split: str):
     """Process the annotations for the YOLO format.
 
     Args:
         path: The path to the output directory.
         raw_data: The list of annotations to process.
-        class_store: The class store containing the class labels.
+        label_idx: A mapping from the unique identifier of each class to its index in the YOLO format.
         split: The split to process (train or test).
     """
-    for i, data in enumerate(raw_data):
-        with Image.open(data.path) as img:
-            img = img.resize((640, 640))
-            img.save(os.path.join(path, split, "images", f"{i}.jpg"))
-
-        with open(os.path.join(path, split, "labels", f"{i}.txt"), "w") as f:
-            for box, label_uid in zip(data.boxes, data.label_uids):
-                label = class_store.get_name(label_uid)
-                x_center, y_center, width, height = box
-
-                # write the label and the normalized box coordinates
-                label_idx = class_store.get_class_names().index(label)
-                f.write(f"{label_idx} {x_center} {y_center} {width} {height}\n")
+    images_dir = os.path.join(path, split, "images")
+    labels_dir = os.path.join(path, split, "labels")
+    # Pillow releases the GIL while decoding, resizing and encoding, so the images are processed in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_save_yolo_image, data.path, os.path.join(images_dir, f"{i}.jpg"))
+            for i, data in enumerate(raw_data)
+        ]
+
+        for i, data in enumerate(raw_data):
+            # write the label and the normalized box coordinates
+            lines = [
+                f"{label_idx[label_uid]} {x_center} {y_center} {width} {height}\n"
+                for (x_center, y_center, width, height), label_uid in zip(data.boxes, data.label_uids)
+            ]
+            # a single write of the encoded file, bypassing the text layer and its newline translation
+            with open(os.path.join(labels_dir, f"{i}.txt"), "wb") as f:
+                f.write("".join(lines).encode())
+
+        for future in futures:
+            future.result()
+
+
+# the EXIF tag of the orientation in which an image is meant to be displayed
+ORIENTATION_TAG = 0x0112
+
+
+def _save_yolo_image(src_path: str, dst_path: str):
+    """Resize an image to the YOLO input size and save it.
+
+    JPEG images that already have the input size are copied as they are, without decoding and re-encoding,
+    unless they have an EXIF orientation. The annotations are made on the stored pixels, but training loaders
+    would rotate a copied image according to its orientation. Re-encoding drops the orientation.
+
+    Args:
+        src_path: The path to the source image.
+        dst_path: The path to save the resized image to.
+    """
+    # release both pixel buffers right after saving, so memory does not grow with the dataset size. Large
+    # images are first reduced by an integer factor with a fast box filter, before the bicubic resampling
+    with Image.open(src_path) as img:
+        if (
+            img.format == "JPEG"
+            and img.mode == "RGB"
+            and img.size == (640, 640)
+            and img.getexif().get(ORIENTATION_TAG, 1) == 1
+        ):
+            shutil.copyfile(src_path, dst_path)
+            return
+        # JPEG supports neither transparency nor palettes, e.g. of PNG images
+        rgb = img if img.mode == "RGB" else img.convert("RGB")
+        with rgb.resize((640, 640), Image.Resampling.BICUBIC, reducing_gap=2.0) as resized:
+            resized.save(dst_path)
@@ -20,6 +20,11 @@ class ClassesStore:
 
     def __init__(self, classes: list[dict[str, str]] | list[str]):
         self.classes: list[dict[str, Any]] = []
+        # indexes into `self.classes`, they hold the same dictionaries and are kept in sync by all methods
+        self._by_uid: dict[int, dict[str, Any]] = {}
+        self._by_name: dict[str, dict[str, Any]] = {}
+        self._default_uid: int | None = None
+        self._names_cache: tuple[str, ...] | None = None
 
         if isinstance(classes[0], str):
             for i, name in enumerate(classes):
@@ -28,16 +33,22 @@ class ClassesStore:
                 )
         else:
             self.classes = classes  # type: ignore
-            if not any(cls["default"] for cls in self.classes):
+            # in a single pass, only the first default is kept
+            has_default = False
+            for cls in self.classes:
+                if cls["default"]:
+                    cls["default"] = not has_default
+                    has_default = True
+            if not has_default:
                 self.classes[0]["default"] = True
-            # if there is more than one default, only the first one is kept
-            if sum(cls["default"] for cls in self.classes) > 1:
-                first_default_idx = next(
-                    i for i, cls in enumerate(self.classes) if cls["default"]
-                )  # pragma: no cover
-                for i, cls in enumerate(self.classes):
-                    if i != first_default_idx:
-                        cls["default"] = False
+            self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the lookup indexes from `self.classes`."""
+        self._by_uid = {cls["uid"]: cls for cls in self.classes}
+        self._by_name = {cls["name"]: cls for cls in self.classes}
+        self._default_uid = next((cls["uid"] for cls in self.classes if cls["default"]), None)
+        self._names_cache = None
 
     def add_class(self, uid: int, name: str, color: str, is_default: bool = False) -> dict[str, Any]:
         """Add a class to the store.
@@ -55,17 +66,23 @@ class ClassesStore:
             ValueError: If a class with the same UID or name already exists, or if more than one class is set
                         as default.
         """
-        if any(cls["uid"] == uid for cls in self.classes):
+        if uid in self._by_uid:
             raise ValueError("Class with the same UID already exists.")
 
-        if any(cls["name"] == name for cls in self.classes):
+        if name in self._by_name:
             raise ValueError("Class with the same name already exists.")
 
-        if is_default and any(cls["default"] for cls in self.classes):
+        if is_default and self._default_uid is not None:
             raise ValueError("Only one class can be the default class.")
 
-        self.classes.append({"uid": uid, "name": name, "color": color, "default": is_default})
-        return self.classes[-1]
+        cls = {"uid": uid, "name": name, "color": color, "default": is_default}
+        self.classes.append(cls)
+        self._by_uid[uid] = cls
+        self._by_name[name] = cls
+        self._names_cache = None
+        if is_default:
+            self._default_uid = uid
+        return cls
 
     def delete_class(self, uid: int) -> None:
         """Delete a class from the store.
@@ -76,12 +93,22 @@ class ClassesStore:
             uid: The unique identifier of the class.
         """
         self.classes = [cls for cls in self.classes if cls["uid"] != uid]
-        if not any(cls["default"] for cls in self.classes):
+        cls = self._by_uid.pop(uid, None)
+        if cls is not None:
+            del self._by_name[cls["name"]]
+        self._names_cache = None
+        if uid == self._default_uid:
             self.classes[0]["default"] = True
+            self._default_uid = self.classes[0]["uid"]
 
     def get_class_names(self) -> list[str]:
-        """Returns a list of all class names."""
-        return [cls["name"] for cls in self.classes]
+        """Returns a list of all class names.
+
+        The names are cached until the classes change, the returned list is a copy that callers may modify.
+        """
+        if self._names_cache is None:
+            self._names_cache = tuple(cls["name"] for cls in self.classes)
+        return list(self._names_cache)
 
     def get_class_uids(self) -> list[int]:
         """Returns a list of all class UIDs."""
@@ -94,7 +121,7 @@ class ClassesStore:
     def get_next_class_name(self) -> str:
         """Returns the next class name in the default naming scheme."""
         name = f"Class {len(self.classes) + 1}"
-        while any(item == name for item in self.get_class_names()):
+        while name in self._by_name:
             name = f"Class {int(name.split()[-1]) + 1}"
         return name
 
@@ -105,21 +132,22 @@ class ClassesStore:
 
     def get_default_uid(self) -> int:
         """Returns the unique identifier of the default class."""
-        return int(next(cls["uid"] for cls in self.classes if cls["default"]))  # pragma: no cover
+        return int(self._default_uid)  # type: ignore
 
     def set_default_uid(self, uid: int) -> None:
         """Set the default class by its unique identifier. The previous default class is unset."""
-        default_class = next(cls for cls in self.classes if cls["default"])  # pragma: no cover
-        default_class["default"] = False
-        next(cls for cls in self.classes if cls["uid"] == uid)["default"] = True  # pragma: no cover
+        new_default = self._by_uid[uid]
+        self._by_uid[self._default_uid]["default"] = False  # type: ignore
+        new_default["default"] = True
+        self._default_uid = uid
 
     def get_color(self, uid: int) -> str:
         """Returns the color of a class by its unique identifier."""
-        return str(next(cls["color"] for cls in self.classes if cls["uid"] == uid))  # pragma: no cover
+        return str(self._by_uid[uid]["color"])
 
     def get_default_class(self) -> dict[str, Any]:
         """Returns the default class."""
-        return next(cls for cls in self.classes if cls["default"])  # pragma: no cover
+        return self._by_uid[self._default_uid]  # type: ignore
 
     def change_name(self, uid: int | list[int], name: str | list[str]) -> None:
         """Change the name of a class or a list of classes by their unique identifiers.
@@ -138,26 +166,35 @@ class ClassesStore:
         if len(uid) != len(name):
             raise ValueError("Number of UIDs and names do not match.")
 
-        if any(n in [cls["name"] for cls in self.classes if cls["uid"] != u] for n, u in zip(name, uid)):
+        if any(n in self._by_name and self._by_name[n]["uid"] != u for n, u in zip(name, uid)):
             raise ValueError("Class with the same name already exists.")
 
         if len(set(name)) != len(name):
             raise ValueError("Class names must be unique.")
 
-        for i, n in zip(uid, name):
-            next(cls for cls in self.classes if cls["uid"] == i)["name"] = n  # pragma: no cover
+        renamed = [self._by_uid[i] for i in uid]
+        for cls in renamed:
+            del self._by_name[cls["name"]]
+        for cls, n in zip(renamed, name):
+            cls["name"] = n
+            self._by_name[n] = cls
+        self._names_cache = None
 
     def change_color(self, uid: int, color: str) -> None:
         """Change the color of a class by its unique identifier."""
-        next(cls for cls in self.classes if cls["uid"] == uid)["color"] = color  # pragma: no cover
+        self._by_uid[uid]["color"] = color
 
     def get_name(self, uid: int) -> str:
         """Returns the name of a class by its unique identifier."""
-        return str(next(cls["name"] for cls in self.classes if cls["uid"] == uid))  # pragma: no cover
+        return str(self._by_uid[uid]["name"])
 
     def get_uid(self, name: str) -> int:
         """Returns the unique identifier of a class by its name"""
-        return int(next(cls["uid"] for cls in self.classes if cls["name"] == name))  # pragma: no cover
+        return int(self._by_name[name]["uid"])
+
+    def has_name(self, name: str) -> bool:
+        """Returns whether a class with the given name exists."""
+        return name in self._by_name
 
     def __getitem__(self, idx: int):
         return self.classes[idx]
@@ -1,34 +1,74 @@
 """A module for storing and managing `SingleImage` objects."""
 
+import itertools
 import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
 
+from PIL import Image
+
 from annotator.model.base_model import DetectionModel
+from annotator.model.detection_worker import DetectionWorker
 from annotator.store.classes_store import ClassesStore
 from annotator.store.single_image import SingleImage
 
 
 class ImageStore:
-    """A class for storing and managing `SingleImage` objects."""
+    """A class for storing and managing `SingleImage` objects.
+
+    Args:
+        class_store: The class store containing the available classes.
+        detection_model: The object detection model to use for automatic annotation.
+        images: An iterable of `SingleImage` or image paths to add to the store.
+        batch_size: The number of images to pass to the detection model at once. Whenever the active image
+            needs to be initialized, the following uninitialized images are initialized in the same batch.
+        background: Whether to run the detection model on a background thread. In this case images are not
+            initialized immediately, instead the results have to be collected with `collect_detections`.
+        cache_detections: Whether to cache the automatic annotations in a file next to each image. Cached
+            annotations are loaded instead of running the detection model again, e.g. in the next session,
+            as long as the image file and the fingerprint of the detection model are unchanged.
+        force_reannotate: Whether to ignore the cached annotations and run the detection model again. The new
+            annotations replace the cached ones, if caching is enabled.
+    """
 
     def __init__(
-        self, class_store: ClassesStore, detection_model: DetectionModel, images: list[SingleImage | str] = []
+        self,
+        class_store: ClassesStore,
+        detection_model: DetectionModel,
+        images: Iterable[SingleImage | str] = [],
+        batch_size: int = 1,
+        background: bool = False,
+        cache_detections: bool = False,
+        force_reannotate: bool = False,
     ):
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+
         self._class_store = class_store
         self._detection_model = detection_model
+        self._batch_size = batch_size
+        self._cache_detections = cache_detections
+        self._force_reannotate = force_reannotate
+        self._worker: DetectionWorker | None = None
+        if background and detection_model is not None:
+            self._worker = DetectionWorker(detection_model, batch_size)
+        self._submitted: set[UUID] = set()
         self._images: list[SingleImage] = []
+        # index into `self._images` by UUID, kept in sync by all methods adding or deleting images
+        self._by_uuid: dict[UUID, SingleImage] = {}
         self.add_images(images)
         self._current_uuid: UUID | None = self._images[0].uuid if len(self._images) > 0 else None
-        if self.active_image is not None:
-            self.active_image.init(self._detection_model)
+        self._init_active()
 
-    def add_images(self, images: list[SingleImage | str] | SingleImage | str) -> list[UUID]:
+    def add_images(self, images: Iterable[SingleImage | str] | SingleImage | str) -> list[UUID]:
         """Add images to the store.
 
         Args:
-            images: A list of `SingleImage` or image paths, or a single `SingleImage` or as single image path.
+            images: An iterable of `SingleImage` or image paths, e.g. a list or a generator yielding the paths
+                of a directory scan, or a single `SingleImage` or as single image path.
         """
-        if not isinstance(images, list):
+        if isinstance(images, SingleImage | str):
             images = [images]
 
         starting_empty = len(self._images) == 0
@@ -38,11 +78,12 @@ class ImageStore:
             if isinstance(img, str):
                 img = SingleImage(img, os.path.basename(img), self._class_store)
             self._images.append(img)
+            self._by_uuid[img.uuid] = img
             new_uuids.append(img.uuid)
 
         if starting_empty and len(new_uuids) > 0:
             self._current_uuid = new_uuids[0]
-            self.active_image.init(self._detection_model)  # type: ignore
+            self._init_active()
 
         return new_uuids
 
@@ -57,16 +98,14 @@ class ImageStore:
         if not isinstance(uuid, list):
             uuid = [uuid]
 
-        if not all(u in [img.uuid for img in self._images] for u in uuid):
+        if not all(u in self._by_uuid for u in uuid):
             raise ValueError("One or more UUIDs are not in the image store.")
 
         if len(uuid) != len(set(uuid)):
             raise ValueError("Duplicate UUIDs provided.")
 
         if self._current_uuid in uuid and len(self._images) > 1:
-            current_idx = self._images.index(
-                next(img for img in self._images if img.uuid == self._current_uuid)
-            )  # pragma: no cover
+            current_idx = self._images.index(self._by_uuid[self._current_uuid])
 
             # here we handle the current uuid, so we remove it from the list of uuids to delete
             uuid = [u for u in uuid if u != self._current_uuid]
@@ -74,12 +113,15 @@ class ImageStore:
             # make sure we select the next uuid from an index that is not out of bounds
             new_idx = current_idx + 1 if current_idx < len(self._images) - 1 else current_idx - 1
             self._current_uuid = self._images[new_idx].uuid
+            del self._by_uuid[self._images[current_idx].uuid]
             del self._images[current_idx]
 
             # the uuid we handled here as already been removed from the list of uuids to delete
             self.delete_images(uuid)
         else:
             self._images = [img for img in self._images if img.uuid not in uuid]
+            for u in uuid:
+                del self._by_uuid[u]
             if len(self._images) == 0:
                 self._current_uuid = None
 
@@ -98,7 +140,7 @@ class ImageStore:
             new_box: The new bounding box coordinates as list with entries [center_x, center_y, width, height]
             new_label_uid: The unique identifier of the new label.
         """
-        if uuid not in [img.uuid for img in self._images]:
+        if uuid not in self._by_uuid:
             raise ValueError("UUID not found in image store.")
 
         if new_box is None and new_label_uid is None:
@@ -112,7 +154,7 @@ class ImageStore:
 
     def activate_image(self, uuid: UUID):
         """Activate an image by its UUID."""
-        if uuid not in [img.uuid for img in self._images]:
+        if uuid not in self._by_uuid:
             raise ValueError("UUID not found in image store.")
 
         self._current_uuid = uuid
@@ -129,9 +171,7 @@ class ImageStore:
         if self._current_uuid is None:
             return
 
-        current_idx = next(
-            i for i, img in enumerate(self._images) if img.uuid == self._current_uuid
-        )  # pragma: no cover
+        current_idx = self._images.index(self._by_uuid[self._current_uuid])
         if current_idx < len(self._images) - 1:
             uuid = self._images[current_idx + 1].uuid
             self.jump_to(uuid)
@@ -147,12 +187,167 @@ class ImageStore:
         Raises:
             ValueError: If the UUID is not found in the image store.
         """
-        if uuid not in [img.uuid for img in self._images]:
+        if uuid not in self._by_uuid:
             raise ValueError("UUID not found in image store.")
 
         self._current_uuid = uuid
-        if self.active_image is not None and not self.active_image.auto_intialized:
+        self._init_active()
+
+    def _init_active(self) -> None:
+        """Initialize the active image with automatic annotation, if it has not been initialized yet.
+
+        Up to `batch_size - 1` uninitialized images following the active image are initialized along with it,
+        so that the detection model can process them in a single batch.
+        """
+        if self.active_image is None or self.active_image.auto_intialized:
+            return
+
+        if self._cache_detections and self._load_existing(self.active_image):
+            return
+
+        if self._detection_model is None or (self._worker is None and self._batch_size == 1):
             self.active_image.init(self._detection_model)
+            if self._cache_detections and self.active_image.auto_intialized:
+                self.active_image.save_detection_cache(self._fingerprint())
+            return
+
+        if self._worker is not None:
+            self._submit_pending()
+            return
+
+        self._predict_batch(self._load_batch(self._pending_images()))
+
+    def prefetch_uninitialized(self, batch_size: int | None = None) -> None:
+        """Initialize all images that have not been initialized yet, in batches.
+
+        The next batch is loaded on a separate thread while the detection model processes the current one.
+
+        Args:
+            batch_size: The number of images to pass to the detection model at once. Defaults to the batch
+                size of the store.
+        """
+        if self._detection_model is None:
+            return
+
+        batch_size = batch_size or self._batch_size
+        pending = [img for img in self._images if not img.auto_intialized and not self._load_existing(img)]
+        batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+        if not batches:
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_batch = executor.submit(self._load_batch, batches[0])
+            for i in range(len(batches)):
+                loaded = next_batch.result()
+                if i + 1 < len(batches):
+                    next_batch = executor.submit(self._load_batch, batches[i + 1])
+                self._predict_batch(loaded)
+
+    def _load_batch(self, images: list[SingleImage]) -> list[tuple[SingleImage, Image.Image]]:
+        """Open and decode the given images.
+
+        Images that can not be loaded are skipped, so they do not prevent the others from being initialized.
+        """
+        loaded: list[tuple[SingleImage, Image.Image]] = []
+        for img in images:
+            try:
+                pil_img = Image.open(img.path)
+            except Exception as e:
+                print(f"Failed to initialize image: {e}")
+                continue
+            try:
+                img.remember_size(pil_img)
+                self._detection_model.draft(pil_img)
+                pil_img.load()
+            except Exception as e:
+                print(f"Failed to initialize image: {e}")
+                pil_img.close()
+                continue
+            loaded.append((img, pil_img))
+        return loaded
+
+    def _predict_batch(self, loaded: list[tuple[SingleImage, Image.Image]]) -> None:
+        """Initialize the loaded images with a single call to the detection model and close them."""
+        try:
+            results = self._detection_model.predict_batch([pil_img for _, pil_img in loaded])
+            for (img, _), res in zip(loaded, results):
+                self._apply_detections(img, res)
+        except Exception as e:
+            print(f"Failed to initialize images: {e}")
+        finally:
+            for _, pil_img in loaded:
+                pil_img.close()
+
+    def _pending_images(self) -> list[SingleImage]:
+        """The active image and the following uninitialized images, up to the batch size.
+
+        Images that can be initialized from a label file or the detection cache next to them are initialized
+        right away and are skipped, as they do not need to be passed to the detection model. They do not count
+        towards the batch size. Images that have already been submitted to the background worker are not
+        returned again, but still take their place in the batch, so that repeated calls do not submit ever
+        further images. No further images are checked once the batch is full.
+        """
+        current_idx = self._images.index(self._by_uuid[self._current_uuid])  # type: ignore[index]
+        pending: list[SingleImage] = []
+        in_batch = 0
+        for img in itertools.islice(self._images, current_idx, None):
+            if in_batch == self._batch_size:
+                break
+            if img.auto_intialized:
+                continue
+            if img.uuid in self._submitted:
+                in_batch += 1
+            elif not self._load_existing(img):
+                pending.append(img)
+                in_batch += 1
+        return pending
+
+    def _load_existing(self, img: SingleImage) -> bool:
+        """Initialize an image from a label file or, if enabled, from the detection cache next to it.
+
+        Returns:
+            Whether the image has been initialized.
+        """
+        if img.load_label_file():
+            return True
+        use_cache = self._cache_detections and not self._force_reannotate
+        return use_cache and img.load_detection_cache(self._fingerprint())
+
+    def _fingerprint(self) -> str:
+        """The fingerprint of the detection model, which the cached annotations must have been made with."""
+        return self._detection_model.fingerprint if self._detection_model is not None else ""
+
+    def _apply_detections(self, img: SingleImage, detections: list[dict]) -> None:
+        """Initialize an image with the output of the detection model and cache it, if enabled."""
+        img.apply_detections(detections)
+        if self._cache_detections:
+            img.save_detection_cache(self._fingerprint())
+
+    def _submit_pending(self) -> None:
+        """Submit the active image and the following uninitialized images to the background worker."""
+        for img in self._pending_images():
+            self._submitted.add(img.uuid)
+            self._worker.submit(img.uuid, img.path)  # type: ignore
+
+    def collect_detections(self) -> bool:
+        """Initialize all images for which the background worker has finished the detection.
+
+        Returns:
+            Whether the active image has been initialized.
+        """
+        if self._worker is None:
+            return False
+
+        active_updated = False
+        for uuid, res in self._worker.collect():
+            # failed images are submitted again the next time they become active
+            self._submitted.discard(uuid)
+            img = self._by_uuid.get(uuid)
+            if res is None or img is None or img.auto_intialized:
+                continue
+            self._apply_detections(img, res)
+            active_updated = active_updated or uuid == self._current_uuid
+        return active_updated
 
     def remove_label(self, label_uid: int, new_label_uid: int | None = None):
         """Remove all bounding boxes with a certain label from the dataset.
@@ -164,10 +359,11 @@ class ImageStore:
             label_uid: The unique identifier of the label to remove.
             new_label_uid: The unique identifier of the new label to assign to the bounding boxes.
         """
-        for img in self._images:
-            if new_label_uid is not None:
+        if new_label_uid is not None:
+            for img in self._images:
                 img.change_all_labels(label_uid, new_label_uid)
-            else:
+        else:
+            for img in self._images:
                 img.delete_all_with_label(label_uid)
 
     @property
@@ -193,10 +389,10 @@ class ImageStore:
         return [img.to_dict() for img in self._images]
 
     def __getitem__(self, uuid: UUID) -> SingleImage:
-        if uuid not in [img.uuid for img in self._images]:
+        if uuid not in self._by_uuid:
             raise ValueError("UUID not found in image store.")
 
-        return next(img for img in self._images if img.uuid == uuid)  # pragma: no cover
+        return self._by_uuid[uuid]
 
     def __len__(self) -> int:
         return len(self._images)
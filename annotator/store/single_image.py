@@ -1,5 +1,7 @@
 """A module for storing annotations for a single image."""
 
+import json
+import os
 from uuid import UUID, uuid4
 
 from PIL import Image
@@ -31,6 +33,21 @@ class SingleImage:
         img_size: The size to which to resize the image for automatic annotation.
     """
 
+    DETECTION_CACHE_SUFFIX = ".ann.json"
+
+    # large datasets hold one instance per image, so they are kept without a per-instance `__dict__`
+    __slots__ = (
+        "path",
+        "name",
+        "class_store",
+        "boxes",
+        "label_uids",
+        "ready",
+        "auto_intialized",
+        "_img_size",
+        "__uuid",
+    )
+
     def __init__(self, path: str, name: str, class_store: ClassesStore) -> None:
         self.path = path
         self.name = name
@@ -39,26 +56,136 @@ class SingleImage:
         self.label_uids: list[int] = []
         self.ready = False
         self.auto_intialized = False
-        img = Image.open(self.path)
-        self.img_size = img.size
-        img.close()
+        self._img_size: tuple[int, int] | None = None
         self.__uuid = uuid4()
 
     def init(self, model: DetectionModel | None):
-        """Initialize the image with automatic annotation using the object detection model."""
-        if self.auto_intialized:
+        """Initialize the image with automatic annotation using the object detection model.
+
+        If a YOLO label file exists alongside the image, the annotations are loaded from it instead.
+        """
+        if self.auto_intialized or self.load_label_file():
             return
         if model is not None:
             try:
-                img = Image.open(self.path)
-                res = model(img)
-                img.close()
-                self.boxes = [r["boxn"] for r in res]
-                self.label_uids = self.labels_to_uids([r["label"] for r in res])
-                self.auto_intialized = True
+                with Image.open(self.path) as img:
+                    self.remember_size(img)
+                    res = model(img)
+                self.apply_detections(res)
             except Exception as e:
                 print(f"Failed to initialize image: {e}")
 
+    def apply_detections(self, detections: list[dict]) -> None:
+        """Initialize the image with the output of an object detection model.
+
+        Boxes that have been added before, e.g. drawn by the user while the detection ran in the background,
+        are kept in front of the detected boxes.
+
+        Args:
+            detections: The detections for this image in the format returned by `DetectionModel.__call__`.
+        """
+        self.boxes = self.boxes + [r["boxn"] for r in detections]
+        self.label_uids = self.label_uids + self.labels_to_uids([r["label"] for r in detections])
+        self.auto_intialized = True
+
+    def load_label_file(self) -> bool:
+        """Initialize the image from a YOLO label file next to it, if one exists.
+
+        The label file must have the same name as the image with a `.txt` extension. Each line contains the
+        class index followed by the normalized box coordinates `center_x center_y width height`. Class indices
+        that are not in the class store are mapped to the default class.
+
+        Returns:
+            Whether the image has been initialized from a label file.
+        """
+        label_path = os.path.splitext(self.path)[0] + ".txt"
+        if not os.path.isfile(label_path):
+            return False
+
+        uids = self.class_store.get_class_uids()
+        default_uid = self.class_store.get_default_uid()
+        boxes, label_uids = [], []
+        try:
+            with open(label_path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    idx, *box = line.split()
+                    if len(box) != 4:
+                        raise ValueError(f"Invalid line in label file: {line.strip()}")
+                    boxes.append([float(v) for v in box])
+                    class_idx = int(idx)
+                    label_uids.append(uids[class_idx] if 0 <= class_idx < len(uids) else default_uid)
+        except ValueError as e:
+            print(f"Failed to load label file {label_path}: {e}")
+            return False
+
+        self.boxes = boxes
+        self.label_uids = label_uids
+        self.auto_intialized = True
+        return True
+
+    @property
+    def detection_cache_path(self) -> str:
+        """The path of the file next to the image in which the automatic annotations are cached."""
+        return self.path + self.DETECTION_CACHE_SUFFIX
+
+    def load_detection_cache(self, fingerprint: str = "") -> bool:
+        """Initialize the image from the cached automatic annotations, if they are up to date.
+
+        The cache is only used if the modification time and the size of the image file are the same as when
+        the cache was written, and if it was written for the same model. Labels that are not in the class
+        store anymore are mapped to the default class.
+
+        Args:
+            fingerprint: The fingerprint of the detection model, see `DetectionModel.fingerprint`.
+
+        Returns:
+            Whether the image has been initialized from the cache.
+        """
+        cache_path = self.detection_cache_path
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+            if cache["source"] != self._file_key() or cache.get("model", "") != fingerprint:
+                return False
+            boxes, labels = cache["boxes"], cache["labels"]
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Failed to load detection cache {cache_path}: {e}")
+            return False
+
+        self.boxes = boxes
+        self.label_uids = self.labels_to_uids(labels)
+        self.auto_intialized = True
+        return True
+
+    def save_detection_cache(self, fingerprint: str = "") -> None:
+        """Cache the current annotations next to the image, so they can be loaded instead of detecting again.
+
+        The labels are stored by name, as the unique identifiers of the classes may differ between sessions.
+
+        Args:
+            fingerprint: The fingerprint of the detection model, see `DetectionModel.fingerprint`.
+        """
+        try:
+            cache = {
+                "source": self._file_key(),
+                "model": fingerprint,
+                "boxes": self.boxes,
+                "labels": self.uids_to_labels(self.label_uids),
+            }
+            with open(self.detection_cache_path, "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"Failed to save detection cache {self.detection_cache_path}: {e}")
+
+    def _file_key(self) -> list[int]:
+        """The modification time in nanoseconds and the size of the image file, which identify its content."""
+        stat = os.stat(self.path)
+        return [stat.st_mtime_ns, stat.st_size]
+
     def mark_ready(self):
         """Mark the image as ready for export."""
         self.ready = True
@@ -111,13 +238,11 @@ class SingleImage:
         Returns:
             A list of unique identifiers corresponding to the class labels.
         """
-        uids = []
-        for label in labels:
-            if label in self.class_store.get_class_names():
-                uids.append(self.class_store.get_uid(label))
-            else:
-                uids.append(self.class_store.get_default_uid())
-        return uids
+        default_uid = self.class_store.get_default_uid()
+        return [
+            self.class_store.get_uid(label) if self.class_store.has_name(label) else default_uid
+            for label in labels
+        ]
 
     def delete_all_with_label(self, label_uid: int) -> None:
         """Delete all bounding boxes with a certain label from the image.
@@ -125,8 +250,11 @@ class SingleImage:
         Args:
             label_uid: The unique identifier of the label to delete.
         """
-        self.boxes = [box for i, box in enumerate(self.boxes) if self.label_uids[i] != label_uid]
-        self.label_uids = [label for label in self.label_uids if label != label_uid]
+        if label_uid not in self.label_uids:
+            return
+        kept = [(box, label) for box, label in zip(self.boxes, self.label_uids) if label != label_uid]
+        self.boxes = [box for box, _ in kept]
+        self.label_uids = [label for _, label in kept]
 
     def change_all_labels(self, old_label_uid: int, new_label_uid: int) -> None:
         """Change all labels of a certain type to a new label for the image.
@@ -135,6 +263,8 @@ class SingleImage:
             old_label_uid: The unique identifier of the label to change.
             new_label_uid: The unique identifier of the new label.
         """
+        if old_label_uid not in self.label_uids:
+            return
         self.label_uids = [new_label_uid if label == old_label_uid else label for label in self.label_uids]
 
     def uids_to_labels(self, uids: list[int]):
@@ -160,6 +290,22 @@ class SingleImage:
             "ready": self.ready,
         }
 
+    def remember_size(self, img: Image.Image) -> None:
+        """Store the size of the opened image file, so that `img_size` does not open the file again.
+
+        Must be called before the image is drafted or resized, as these change its size.
+        """
+        if self._img_size is None:
+            self._img_size = img.size
+
+    @property
+    def img_size(self) -> tuple[int, int]:
+        """The size of the image as (width, height), read from the file header on first access."""
+        if self._img_size is None:
+            with Image.open(self.path) as img:
+                self._img_size = img.size
+        return self._img_size
+
     @property
     def uuid(self) -> UUID:
         return self.__uuid
@@ -23,3 +23,7 @@ class UI(ABC, ctk.CTk):
     @abstractmethod
     def refresh_right_sidebar(self):
         pass
+
+    @abstractmethod
+    def is_busy(self) -> bool:
+        pass
@@ -15,8 +15,21 @@ def main():
     yolo_model = YOLO("yolov8m.pt")  # Load the YOLO model
     model = YOLODetectionModel(yolo_model, ["none", "buoy", "boat"])  # Create a detection model
     base_path = r"C:\Users\m-kor\OneDrive\Bilder\Buoys"
-    image_paths = [os.path.join(base_path, image) for image in os.listdir(base_path) if image.lower().endswith((".jpg", ".jpeg", ".png"))]
-    controller = Controller(["none", "buoy", "boat"], model, cast(list[SingleImage | str], image_paths))
+    with os.scandir(base_path) as entries:
+        image_paths = sorted(
+            entry.path
+            for entry in entries
+            if entry.is_file() and entry.name.lower().endswith((".jpg", ".jpeg", ".png"))
+        )
+    # detect the next few images along with the active one, so they are ready when navigating forward
+    controller = Controller(
+        ["none", "buoy", "boat"],
+        model,
+        cast(list[SingleImage | str], image_paths),
+        batch_size=4,
+        background=True,
+        cache_detections=True,
+    )
     app = ImageAnnotationGUI(controller)
     controller.set_view(app)
     app.mainloop()
@@ -5,6 +5,7 @@ import os
 import random
 import tempfile
 from abc import ABC
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -12,6 +13,7 @@ import yaml
 from PIL import Image
 
 from annotator.store.annotation_export import export
+from annotator.store.image_store import ImageStore
 from annotator.store.single_image import SingleImage
 from tests.store.base_environment import TestEnvironment
 
@@ -225,6 +227,25 @@ class TestExportJSON(TestExportBase):
                 created = json.load(f)
             self.assertEqual(created, ground_truth)
 
+    def test_without_orjson(self) -> None:
+        """Test exporting annotations to a JSON file with the standard library serializer."""
+        self.init_all_images(self.image_store._images)
+        self.init_all_images(self.ground_truth_img_list)
+
+        with patch("annotator.store.annotation_export.orjson", None):
+            export(self.temp_file, "json", self.image_store, self.class_store, False, 0.0, seed=0)
+
+        random.seed(0)
+        random.shuffle(self.ground_truth_img_list)
+        ground_truth = dict(
+            class_mapping=self.class_store.classes,
+            train=[img.to_dict() for img in self.ground_truth_img_list],
+            test=[],
+        )
+        with open(self.temp_file) as f:
+            created = json.load(f)
+        self.assertEqual(created, ground_truth)
+
 
 class TestExportYOLO(TestExportBase):
     """Class for testing the YOLO export functionality."""
@@ -233,6 +254,39 @@ class TestExportYOLO(TestExportBase):
         """Initialize the test case."""
         super().__init__("test", *args, **kwargs)
 
+    def test_non_rgb_image(self) -> None:
+        """Test exporting a PNG image with transparency, which can not be saved as JPEG directly."""
+        png_path = os.path.join(self.temp_dir.name, "transparent.png")
+        Image.new("RGBA", (800, 600), (255, 0, 0, 128)).save(png_path)
+        self.image_store = ImageStore(self.class_store, self.mock_model, [png_path])
+
+        export(self.temp_file, "yolo", self.image_store, self.class_store, False, 0.0)
+        with Image.open(os.path.join(self.temp_file, "train", "images", "0.jpg")) as img:
+            self.assertEqual(img.mode, "RGB")
+            self.assertEqual(img.size, (640, 640))
+
+    def test_image_with_input_size(self) -> None:
+        """Test that a JPEG image that already has the YOLO input size is copied without re-encoding."""
+        jpg_path = os.path.join(self.temp_dir.name, "input_size.jpg")
+        Image.new("RGB", (640, 640), (0, 128, 255)).save(jpg_path)
+        self.image_store = ImageStore(self.class_store, self.mock_model, [jpg_path])
+
+        export(self.temp_file, "yolo", self.image_store, self.class_store, False, 0.0)
+        exported_path = os.path.join(self.temp_file, "train", "images", "0.jpg")
+        with open(jpg_path, "rb") as src, open(exported_path, "rb") as dst:
+            self.assertEqual(src.read(), dst.read())
+
+        # an image with an EXIF orientation is re-encoded without it, as the boxes refer to the stored pixels
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        Image.new("RGB", (640, 640), (0, 128, 255)).save(jpg_path, exif=exif)
+        self.image_store = ImageStore(self.class_store, self.mock_model, [jpg_path])
+        export_path = os.path.join(self.temp_file, "oriented")
+        export(export_path, "yolo", self.image_store, self.class_store, False, 0.0)
+        with Image.open(os.path.join(export_path, "train", "images", "0.jpg")) as exported:
+            self.assertEqual(exported.size, (640, 640))
+            self.assertNotIn(0x0112, exported.getexif())
+
     def _check_folder_structure_and_yaml(self) -> None:
         """Check if the folder structure is correct."""
         self.assertTrue(os.path.exists(os.path.join(self.temp_file, "train", "images")))
@@ -83,6 +83,22 @@ class TestClassesStore(unittest.TestCase):
         """Test getting class names."""
         self.assertEqual(self.store.get_class_names(), self.classes_str)
 
+    def test_get_class_names_modified_by_caller(self) -> None:
+        """Test that modifying the returned list does not change the cached class names."""
+        names = self.store.get_class_names()
+        names.remove(self.classes_str[1])
+        self.assertEqual(self.store.get_class_names(), self.classes_str)
+
+    def test_get_class_names_after_change(self) -> None:
+        """Test that the cached class names follow changes to the classes."""
+        self.assertEqual(self.store.get_class_names(), self.classes_str)
+        self.store.add_class(3, "class3", "#FFFFFF")
+        self.assertEqual(self.store.get_class_names(), self.classes_str + ["class3"])
+        self.store.change_name(3, "new_name")
+        self.assertEqual(self.store.get_class_names(), self.classes_str + ["new_name"])
+        self.store.delete_class(0)
+        self.assertEqual(self.store.get_class_names(), self.classes_str[1:] + ["new_name"])
+
     def test_get_class_uids(self) -> None:
         """Test getting class UIDs."""
         self.assertEqual(self.store.get_class_uids(), [cls["uid"] for cls in self.classes_dict])
@@ -181,6 +197,26 @@ class TestClassesStore(unittest.TestCase):
         for cls in self.classes_dict:
             self.assertEqual(self.store.get_uid(cast(str, cls["name"])), cls["uid"])
 
+    def test_has_name(self) -> None:
+        """Test checking whether a class name exists."""
+        self.assertTrue(self.store.has_name("class0"))
+        self.assertFalse(self.store.has_name("class3"))
+        self.store.add_class(3, "class3", "#FFFFFF")
+        self.assertTrue(self.store.has_name("class3"))
+        self.store.delete_class(3)
+        self.assertFalse(self.store.has_name("class3"))
+
+    def test_lookup_after_change_name(self) -> None:
+        """Test that lookups by name follow renamed classes."""
+        self.store.change_name([0, 1], ["new_name0", "new_name"])
+        self.assertEqual(self.store.get_uid("new_name0"), 0)
+        self.assertEqual(self.store.get_uid("new_name"), 1)
+        self.assertFalse(self.store.has_name("class0"))
+        with self.assertRaises(ValueError):
+            self.store.add_class(3, "new_name", "#FFFFFF")
+        self.store.add_class(3, "class0", "#FFFFFF")
+        self.assertEqual(self.store.get_uid("class0"), 3)
+
     def test_get_item(self) -> None:
         """Test getting a class by its UID."""
         for i, cls in enumerate(self.classes_dict):
@@ -1,8 +1,12 @@
 """This module tests the image store."""
 
 import os
+import shutil
+import tempfile
+import time
 from uuid import uuid4
 
+from annotator.model.mock_model import MockModel
 from annotator.store.image_store import ImageStore
 from annotator.store.single_image import SingleImage
 from tests.store.base_environment import TestEnvironment
@@ -60,6 +64,16 @@ class TestImageStore(TestEnvironment):
         ground_truth = self.ground_truth_img_list + new_imgs
         self._check_img_lists_equal(self.image_store._images, ground_truth)
 
+    def test_add_image_paths_from_generator(self) -> None:
+        """Test adding multiple images by providing a generator of their paths."""
+        new_img_paths = [os.path.join(self.base_path, img_name) for img_name in self.additional_image_names]
+        self.image_store.add_images(path for path in new_img_paths)
+        new_imgs = [
+            SingleImage(img_path, os.path.basename(img_path), self.class_store) for img_path in new_img_paths
+        ]
+        ground_truth = self.ground_truth_img_list + new_imgs
+        self._check_img_lists_equal(self.image_store._images, ground_truth)
+
     def test_add_multiple_images(self) -> None:
         """Test adding multiple images by providing the images themselves."""
         new_imgs = [
@@ -304,6 +318,165 @@ class TestImageStore(TestEnvironment):
         self.image_store.next()
         self.assertEqual(self.image_store._current_uuid, self.image_store._images[0].uuid)
 
+    def test_invalid_batch_size(self) -> None:
+        """Test creating a store with an invalid batch size."""
+        with self.assertRaises(ValueError):
+            ImageStore(self.class_store, self.mock_model, batch_size=0)
+
+    def test_batch_init(self) -> None:
+        """Test that the following images are initialized in the same batch as the active image."""
+        self.image_store = ImageStore(self.class_store, self.mock_model, self.cast(self.image_paths), 2)
+        self.init_all_images(self.ground_truth_img_list[:2])
+        self._check_img_lists_equal(self.image_store._images, self.ground_truth_img_list)
+
+        self.image_store.next()
+        self.assertFalse(self.image_store._images[2].auto_intialized)
+        self.image_store.next()
+        self.init_all_images(self.ground_truth_img_list)
+        self._check_img_lists_equal(self.image_store._images, self.ground_truth_img_list)
+
+    def test_batch_init_with_label_file(self) -> None:
+        """Test that an image initialized from a label file does not take a place in the batch."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        paths = [shutil.copy(path, tmp_dir) for path in self.image_paths]
+        with open(os.path.splitext(paths[1])[0] + ".txt", "w") as f:
+            f.write("1 0.5 0.5 0.2 0.2\n")
+
+        self.image_store = ImageStore(self.class_store, self.mock_model, self.cast(paths), 2)
+        self.assertTrue(self.image_store._images[0].auto_intialized)
+        self.assertEqual(self.image_store._images[1].boxes, [[0.5, 0.5, 0.2, 0.2]])
+        self.assertTrue(self.image_store._images[2].auto_intialized)
+
+    def test_batch_init_invalid_path(self) -> None:
+        """Test that an image that can not be opened does not prevent the others from being initialized."""
+        self.images[1].path = "invalid_path"
+        self.image_store = ImageStore(self.class_store, self.mock_model, self.cast(self.images), 3)
+        self.assertTrue(self.image_store._images[0].auto_intialized)
+        self.assertFalse(self.image_store._images[1].auto_intialized)
+        self.assertTrue(self.image_store._images[2].auto_intialized)
+
+    def test_prefetch_uninitialized(self) -> None:
+        """Test initializing all remaining images in batches."""
+        self.image_store.add_images(self.cast(self.additional_image_paths))
+        self.image_store.prefetch_uninitialized(batch_size=3)
+        ground_truth = self.ground_truth_img_list + self.additional_images
+        self.init_all_images(ground_truth)
+        self._check_img_lists_equal(self.image_store._images, ground_truth)
+
+    def _collect_detections(self) -> bool:
+        """Collect the background detections, waiting until the worker has produced a result."""
+        for _ in range(100):
+            if self.image_store.collect_detections():
+                return True
+            time.sleep(0.05)
+        return False
+
+    def test_background_init(self) -> None:
+        """Test initializing images on a background thread."""
+        self.image_store = ImageStore(
+            self.class_store, self.mock_model, self.cast(self.image_paths), background=True
+        )
+        self.assertFalse(self.image_store._images[0].auto_intialized)
+        self.assertTrue(self._collect_detections())
+        self._check_img_lists_equal(self.image_store._images, self.ground_truth_img_list)
+
+        self.image_store.next()
+        self.assertFalse(self.image_store._images[1].auto_intialized)
+        self.assertTrue(self._collect_detections())
+        self.assertTrue(self.image_store._images[1].auto_intialized)
+
+    def test_background_init_keeps_added_boxes(self) -> None:
+        """Test that boxes added while the detection runs in the background are kept."""
+        self.image_store = ImageStore(
+            self.class_store, self.mock_model, self.cast(self.image_paths), background=True
+        )
+        self.image_store._images[0].add_box([0.1, 0.1, 0.2, 0.2], 2)
+        self.assertTrue(self._collect_detections())
+        self.ground_truth_img_list[0].init(self.mock_model)
+        self.assertEqual(
+            self.image_store._images[0].boxes, [[0.1, 0.1, 0.2, 0.2]] + self.ground_truth_img_list[0].boxes
+        )
+        self.assertEqual(
+            self.image_store._images[0].label_uids, [2] + self.ground_truth_img_list[0].label_uids
+        )
+
+    def test_background_init_retry(self) -> None:
+        """Test that an image that failed in the background is submitted again when it becomes active."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        paths = [shutil.copy(path, tmp_dir) for path in self.image_paths]
+        os.rename(paths[0], paths[0] + ".bak")
+
+        self.image_store = ImageStore(self.class_store, self.mock_model, self.cast(paths), background=True)
+        for _ in range(100):
+            self.image_store.collect_detections()
+            if not self.image_store._submitted:
+                break
+            time.sleep(0.05)
+        self.assertFalse(self.image_store._images[0].auto_intialized)
+
+        os.rename(paths[0] + ".bak", paths[0])
+        self.image_store.jump_to(self.image_store._images[0].uuid)
+        self.assertTrue(self._collect_detections())
+        self.assertTrue(self.image_store._images[0].auto_intialized)
+
+    def test_cache_detections(self) -> None:
+        """Test that cached detections are loaded instead of running the detection model again."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        paths = [shutil.copy(path, tmp_dir) for path in self.image_paths]
+
+        self.image_store = ImageStore(
+            self.class_store, self.mock_model, self.cast(paths), batch_size=2, cache_detections=True
+        )
+        self.image_store.prefetch_uninitialized()
+        for path in paths:
+            self.assertTrue(os.path.exists(path + SingleImage.DETECTION_CACHE_SUFFIX))
+
+        model = MockModel([[0, 0, 10, 10]], ["class1"], None, self.img_size)
+        self.image_store = ImageStore(self.class_store, model, self.cast(paths), cache_detections=True)
+        self.image_store.prefetch_uninitialized()
+        ground_truth = [SingleImage(path, os.path.basename(path), self.class_store) for path in paths]
+        self.init_all_images(ground_truth)
+        self._check_img_lists_equal(self.image_store._images, ground_truth)
+
+    def test_cache_detections_bypassed(self) -> None:
+        """Test that cached detections are not used with another model or when reannotating is forced."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        paths = [shutil.copy(path, tmp_dir) for path in self.image_paths]
+        self.image_store = ImageStore(
+            self.class_store, self.mock_model, self.cast(paths), cache_detections=True
+        )
+        self.image_store.prefetch_uninitialized()
+
+        class OtherModel(MockModel):
+            fingerprint = "other"
+
+        model = OtherModel([[0, 0, 10, 10]], ["class1"], None, self.img_size)
+        ground_truth = [SingleImage(path, os.path.basename(path), self.class_store) for path in paths]
+        for img in ground_truth:
+            img.init(model)
+        self.image_store = ImageStore(self.class_store, model, self.cast(paths), cache_detections=True)
+        self.image_store.prefetch_uninitialized()
+        self._check_img_lists_equal(self.image_store._images, ground_truth)
+
+        # the cache now holds the detections of `OtherModel`, which are ignored when reannotating is forced
+        model = OtherModel([[0, 0, 20, 20]], ["class1"], None, self.img_size)
+        ground_truth = [SingleImage(path, os.path.basename(path), self.class_store) for path in paths]
+        for img in ground_truth:
+            img.init(model)
+        self.image_store = ImageStore(
+            self.class_store, model, self.cast(paths), cache_detections=True, force_reannotate=True
+        )
+        self.image_store.prefetch_uninitialized()
+        self._check_img_lists_equal(self.image_store._images, ground_truth)
+
+    def test_collect_detections_foreground(self) -> None:
+        """Test that collecting detections without a background worker does nothing."""
+        self.assertFalse(self.image_store.collect_detections())
+
     def test_jump_to_invalid(self) -> None:
         """Test jumping to an invalid image."""
         with self.assertRaises(ValueError):
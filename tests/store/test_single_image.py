@@ -1,6 +1,8 @@
 """This module tests the `SingleImage` class."""
 
 import os
+import shutil
+import tempfile
 import unittest
 from uuid import UUID
 
@@ -50,6 +52,12 @@ class TestSingleImage(unittest.TestCase):
         # check that passing None does not raise an error
         self.img.init(None)
 
+    def test_init_auto_remembers_size(self):
+        self.img.init(self.model)
+        # the size is read while the image is open for the detection, so the file is not needed anymore
+        self.img.path = "invalid_path"
+        self.assertEqual(self.img.img_size, self.img_size)
+
     def test_init_auto_fail(self):
         self.img.path = "invalid_path"
         self.img.init(self.model)
@@ -57,6 +65,72 @@ class TestSingleImage(unittest.TestCase):
         self.assertEqual(self.img.label_uids, [])
         self.assertFalse(self.img.auto_intialized)
 
+    def _copy_with_label_file(self, content: str) -> SingleImage:
+        """Copy the test image to a temporary directory and write a label file next to it."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        img_path = os.path.join(tmp_dir, self.img_name)
+        shutil.copy(self.img_path, img_path)
+        with open(os.path.splitext(img_path)[0] + ".txt", "w") as f:
+            f.write(content)
+        return SingleImage(img_path, self.img_name, self.classes_store)
+
+    def test_init_from_label_file(self):
+        img = self._copy_with_label_file("1 0.5 0.5 0.2 0.2\n2 0.1 0.2 0.3 0.4\n\n7 0.1 0.1 0.1 0.1\n")
+        img.init(self.model)
+        self.assertTrue(img.auto_intialized)
+        self.assertEqual(img.boxes, [[0.5, 0.5, 0.2, 0.2], [0.1, 0.2, 0.3, 0.4], [0.1, 0.1, 0.1, 0.1]])
+        self.assertEqual(img.label_uids, [1, 2, 0])
+
+    def test_init_from_invalid_label_file(self):
+        img = self._copy_with_label_file("1 0.5 0.5\n")
+        self.assertFalse(img.load_label_file())
+        img.init(self.model)
+        self.assertEqual(img.label_uids, [1])
+
+    def _copy_image(self) -> SingleImage:
+        """Copy the test image to a temporary directory."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        img_path = os.path.join(tmp_dir, self.img_name)
+        shutil.copy(self.img_path, img_path)
+        return SingleImage(img_path, self.img_name, self.classes_store)
+
+    def test_detection_cache(self):
+        img = self._copy_image()
+        self.assertFalse(img.load_detection_cache())
+        img.init(self.model)
+        img.save_detection_cache()
+
+        cached = SingleImage(img.path, self.img_name, self.classes_store)
+        self.assertTrue(cached.load_detection_cache())
+        self.assertTrue(cached.auto_intialized)
+        self.assertEqual(cached.boxes, img.boxes)
+        self.assertEqual(cached.label_uids, img.label_uids)
+
+    def test_detection_cache_outdated(self):
+        img = self._copy_image()
+        img.init(self.model)
+        img.save_detection_cache()
+        # the image is replaced after the annotations have been cached, keeping an older modification time
+        mtime = os.path.getmtime(img.path)
+        with open(img.path, "ab") as f:
+            f.write(b"\0")
+        os.utime(img.path, (mtime - 10, mtime - 10))
+
+        cached = SingleImage(img.path, self.img_name, self.classes_store)
+        self.assertFalse(cached.load_detection_cache())
+        self.assertFalse(cached.auto_intialized)
+
+    def test_detection_cache_other_model(self):
+        img = self._copy_image()
+        img.init(self.model)
+        img.save_detection_cache("model_a")
+
+        cached = SingleImage(img.path, self.img_name, self.classes_store)
+        self.assertFalse(cached.load_detection_cache("model_b"))
+        self.assertTrue(cached.load_detection_cache("model_a"))
+
     def test_mark_ready(self):
         self.assertFalse(self.img.ready)
         self.img.mark_ready()
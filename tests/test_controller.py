@@ -33,6 +33,7 @@ class TestController(unittest.TestCase):
             )
 
         # Set the view for the controller
+        self.mock_ui.is_busy.return_value = False
         self.controller.set_view(self.mock_ui)
         self.assertEqual(self.controller._view, self.mock_ui)
 
@@ -88,6 +89,31 @@ class TestController(unittest.TestCase):
         self.mock_ui.redraw_content.assert_not_called()
         self.mock_ui.refresh_right_sidebar.assert_called_once()
 
+    def test_poll_detections(self):
+        """Test the poll_detections method redraws only if the active image has been initialized."""
+        self.mock_image_store.collect_detections.return_value = False
+        self.controller.poll_detections()
+        self.mock_ui.redraw_content.assert_not_called()
+        self.mock_ui.after.assert_called_once_with(Controller.POLL_INTERVAL, self.controller.poll_detections)
+
+        self.mock_image_store.collect_detections.return_value = True
+        self.controller.poll_detections()
+        self.mock_ui.redraw_content.assert_called_once_with(only_boxes=True)
+        self.mock_ui.refresh_right_sidebar.assert_called_once()
+
+    def test_poll_detections_busy(self):
+        """Test the poll_detections method leaves the detections uncollected while the view is busy."""
+        self.mock_ui.is_busy.return_value = True
+        self.mock_image_store.collect_detections.return_value = True
+        self.controller.poll_detections()
+        self.mock_image_store.collect_detections.assert_not_called()
+        self.mock_ui.redraw_content.assert_not_called()
+        self.mock_ui.after.assert_called_once_with(Controller.POLL_INTERVAL, self.controller.poll_detections)
+
+        self.mock_ui.is_busy.return_value = False
+        self.controller.poll_detections()
+        self.mock_ui.redraw_content.assert_called_once_with(only_boxes=True)
+
     def test_image_names(self):
         """Test the image_names method is returning the correct value."""
         expected_names = ["image1.jpg", "image2.png"]